@@ -0,0 +1,465 @@
+"""
+Нагрузочный тест YaNews и YaNote.
+
+Поднимает WSGI-приложение проекта в этом же процессе на временной базе
+SQLite (или бьёт по уже запущенному серверу через --url), заполняет
+базу синтетическими данными и гоняет взвешенную смесь действий
+пользователей. По каждому действию печатает пропускную способность,
+p50/p95/p99 задержки и долю ошибок и сохраняет результат в JSON,
+который можно сравнить с прошлым прогоном через --compare.
+
+    python load_test.py news --duration 30 --users 8 --out news.json
+    python load_test.py note --compare news-old.json --out news-new.json
+
+В режиме --url данные пишутся в базу из настроек проекта: направляйте
+его только на одноразовую базу. Сервер в том же процессе делит GIL с
+генератором нагрузки, поэтому для абсолютных цифр лучше --url.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import secrets
+import statistics
+import string
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from http.cookies import SimpleCookie
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+BASE_DIR = Path(__file__).resolve().parent
+
+PROJECTS = {
+    'news': ('ya_news', 'yanews'),
+    'note': ('ya_note', 'yanote'),
+}
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietHandler(WSGIRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+
+class Browser:
+    """HTTP-клиент одного пользователя: куки сессии и CSRF."""
+
+    def __init__(self, base_url, session_key=None):
+        url = urllib.parse.urlsplit(base_url)
+        self.host, self.port = url.hostname, url.port or 80
+        # Django принимает одинаковый токен в куке и заголовке.
+        self.csrf_token = ''.join(
+            secrets.choice(string.ascii_letters + string.digits)
+            for _ in range(32)
+        )
+        self.cookies = {'csrftoken': self.csrf_token}
+        if session_key:
+            self.cookies['sessionid'] = session_key
+
+    def request(self, method, path, data=None):
+        headers = {
+            'Cookie': '; '.join(f'{k}={v}' for k, v in self.cookies.items()),
+        }
+        body = None
+        if data is not None:
+            body = urllib.parse.urlencode(data)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+            headers['X-CSRFToken'] = self.csrf_token
+        connection = http.client.HTTPConnection(
+            self.host, self.port, timeout=30
+        )
+        try:
+            connection.request(method, path, body, headers)
+            response = connection.getresponse()
+            response.read()
+        finally:
+            connection.close()
+        for header in response.headers.get_all('Set-Cookie') or ():
+            for name, morsel in SimpleCookie(header).items():
+                self.cookies[name] = morsel.value
+        return response.status
+
+    def get(self, path):
+        return self.request('GET', path)
+
+    def post(self, path, data):
+        return self.request('POST', path, data)
+
+
+def login(user):
+    """Ключ новой сессии, в которой пользователь уже вошёл."""
+    from django.contrib.auth import (
+        BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+    )
+    from django.contrib.sessions.backends.db import SessionStore
+
+    session = SessionStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.save()
+    return session.session_key
+
+
+def create_users(count, prefix):
+    from django.contrib.auth import get_user_model
+
+    User = get_user_model()
+    User.objects.bulk_create(
+        User(username=f'{prefix}-{number}') for number in range(count)
+    )
+    return list(User.objects.filter(username__startswith=f'{prefix}-'))
+
+
+class NewsScenario:
+    """Анонимное чтение и комментарии вошедших пользователей."""
+    # Действие: вес в смеси.
+    weights = {
+        'home': 40,
+        'detail': 25,
+        'comments_feed': 10,
+        'search': 5,
+        'comment': 10,
+        'edit': 6,
+        'delete': 4,
+    }
+    # Действия, которые выполняются без входа: их отдаёт кеш страниц.
+    anonymous = frozenset({'home', 'detail', 'comments_feed', 'search'})
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def seed(self, scale, users):
+        from news.models import Comment, News
+
+        News.objects.bulk_create(
+            News(title=f'Новость {number}', text='Текст новости. ' * 30)
+            for number in range(scale)
+        )
+        self.news_ids = list(News.objects.values_list('id', flat=True))
+        authors = create_users(users, 'load-news')
+        Comment.objects.bulk_create(
+            Comment(
+                news_id=self.rng.choice(self.news_ids),
+                author=author,
+                text=f'Комментарий {number}',
+            )
+            for author in authors for number in range(scale // users + 5)
+        )
+        News.objects.recount_comments()
+        return [
+            {
+                'session': login(author),
+                'comments': list(author.comment_set.values_list(
+                    'id', flat=True
+                )),
+            }
+            for author in authors
+        ]
+
+    def home(self, user, browser):
+        return browser.get('/')
+
+    def detail(self, user, browser):
+        return browser.get(f'/news/{user["rng"].choice(self.news_ids)}/')
+
+    def comments_feed(self, user, browser):
+        return browser.get(
+            f'/api/news/{user["rng"].choice(self.news_ids)}/comments/'
+        )
+
+    def search(self, user, browser):
+        return browser.get('/search/?q=' + urllib.parse.quote('новость'))
+
+    def comment(self, user, browser):
+        return browser.post(
+            f'/news/{user["rng"].choice(self.news_ids)}/',
+            {'text': 'Комментарий под нагрузкой'},
+        )
+
+    def edit(self, user, browser):
+        if not user['comments']:
+            return self.comment(user, browser)
+        return browser.post(
+            f'/edit_comment/{user["rng"].choice(user["comments"])}/',
+            {'text': 'Исправленный комментарий'},
+        )
+
+    def delete(self, user, browser):
+        if not user['comments']:
+            return self.comment(user, browser)
+        comment_id = user['comments'].pop()
+        return browser.post(f'/delete_comment/{comment_id}/', {})
+
+
+class NoteScenario:
+    """Работа вошедших пользователей со своими заметками."""
+    weights = {
+        'list': 25,
+        'detail': 25,
+        'search': 10,
+        'api_list': 5,
+        'create': 15,
+        'edit': 12,
+        'delete': 8,
+    }
+    anonymous = frozenset()
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def seed(self, scale, users):
+        from notes.models import Note
+
+        authors = create_users(users, 'load-note')
+        Note.objects.bulk_create(
+            Note(
+                title=f'Заметка {number}',
+                text='Текст заметки. ' * 20,
+                slug=f'load-{author.pk}-{number}',
+                author=author,
+            )
+            for author in authors for number in range(scale)
+        )
+        return [
+            {
+                'session': login(author),
+                'slugs': list(author.note_set.values_list('slug', flat=True)),
+            }
+            for author in authors
+        ]
+
+    def list(self, user, browser):
+        return browser.get('/notes/')
+
+    def detail(self, user, browser):
+        if not user['slugs']:
+            return self.create(user, browser)
+        return browser.get(f'/note/{user["rng"].choice(user["slugs"])}/')
+
+    def search(self, user, browser):
+        return browser.get('/search/?q=' + urllib.parse.quote('заметка'))
+
+    def api_list(self, user, browser):
+        return browser.get('/api/notes/')
+
+    def create(self, user, browser):
+        slug = f'load-{secrets.token_hex(6)}'
+        status = browser.post(
+            '/add/',
+            {'title': 'Новая заметка', 'text': 'Текст', 'slug': slug},
+        )
+        if status == 302:
+            user['slugs'].append(slug)
+        return status
+
+    def edit(self, user, browser):
+        if not user['slugs']:
+            return self.create(user, browser)
+        slug = user['rng'].choice(user['slugs'])
+        return browser.post(
+            f'/edit/{slug}/',
+            {'title': 'Исправленная', 'text': 'Новый текст', 'slug': slug},
+        )
+
+    def delete(self, user, browser):
+        if not user['slugs']:
+            return self.create(user, browser)
+        slug = user['slugs'].pop(user['rng'].randrange(len(user['slugs'])))
+        return browser.post(f'/delete/{slug}/', {})
+
+
+SCENARIOS = {'news': NewsScenario, 'note': NoteScenario}
+
+
+def setup_django(project, url):
+    """
+    Настраивает Django проекта; без --url — на временной базе.
+
+    Возвращает временный каталог базы: он удаляется вместе с объектом.
+    """
+    directory, package = PROJECTS[project]
+    sys.path.insert(0, str(BASE_DIR / directory))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', f'{package}.settings')
+    os.environ.setdefault('SQLITE_PROFILE', 'production')
+    import django
+    from django.conf import settings
+
+    directory = None
+    if url is None:
+        directory = tempfile.TemporaryDirectory()
+        settings.DATABASES['default']['NAME'] = (
+            Path(directory.name) / 'load.sqlite3'
+        )
+    # Отладка копит все SQL-запросы в памяти и включает поиск N+1,
+    # а строка лога на каждый запрос заглушила бы отчёт.
+    settings.DEBUG = False
+    for name in ('instrumentation', 'nplusone'):
+        settings.LOGGING['loggers'][f'{package}.{name}']['level'] = 'ERROR'
+    django.setup()
+    if url is None:
+        from django.core.management import call_command
+
+        call_command('migrate', verbosity=0)
+    return directory
+
+
+def start_server(project):
+    from django.core.wsgi import get_wsgi_application
+
+    server = make_server(
+        '127.0.0.1', 0, get_wsgi_application(),
+        server_class=ThreadingWSGIServer, handler_class=QuietHandler,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def run_user(scenario, user, base_url, deadline, seed, results):
+    """
+    Цикл одного пользователя до deadline; пишет (действие, мс, ок).
+
+    У каждого пользователя свой генератор случайных чисел: общий на все
+    потоки делал бы прогон с тем же --seed невоспроизводимым.
+    """
+    rng = user['rng'] = random.Random(seed)
+    browsers = {
+        False: Browser(base_url, user['session']),
+        True: Browser(base_url),
+    }
+    actions = list(scenario.weights)
+    weights = list(scenario.weights.values())
+    while time.monotonic() < deadline:
+        action = rng.choices(actions, weights)[0]
+        browser = browsers[action in scenario.anonymous]
+        started = time.perf_counter()
+        try:
+            status = getattr(scenario, action)(user, browser)
+            ok = status < 400
+        except (OSError, http.client.HTTPException):
+            ok = False
+        results.append(
+            (action, (time.perf_counter() - started) * 1000, ok)
+        )
+
+
+def summarize(results, duration):
+    routes = {}
+    for action, elapsed, ok in results:
+        route = routes.setdefault(action, {'timings': [], 'errors': 0})
+        route['timings'].append(elapsed)
+        route['errors'] += not ok
+    summary = {}
+    for action, route in sorted(routes.items()):
+        timings = route['timings']
+        cuts = statistics.quantiles(timings, n=100) if len(timings) > 1 \
+            else timings * 99
+        summary[action] = {
+            'requests': len(timings),
+            'rps': len(timings) / duration,
+            'p50_ms': cuts[49],
+            'p95_ms': cuts[94],
+            'p99_ms': cuts[98],
+            'error_rate': route['errors'] / len(timings),
+        }
+    return summary
+
+
+def print_summary(summary, previous=None):
+    print(
+        f'{"route":<16}{"requests":>10}{"rps":>9}{"p50":>9}{"p95":>9}'
+        f'{"p99":>9}{"errors":>9}'
+        + (f'{"Δp95":>10}{"Δrps":>9}' if previous else '')
+    )
+    for action, stats in summary.items():
+        line = (
+            f'{action:<16}{stats["requests"]:>10}{stats["rps"]:>9.1f}'
+            f'{stats["p50_ms"]:>9.1f}{stats["p95_ms"]:>9.1f}'
+            f'{stats["p99_ms"]:>9.1f}{stats["error_rate"]:>9.1%}'
+        )
+        before = (previous or {}).get(action)
+        if before:
+            line += (
+                f'{stats["p95_ms"] / before["p95_ms"] - 1:>+10.0%}'
+                f'{stats["rps"] / before["rps"] - 1:>+9.0%}'
+            )
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.split('\n\n')[0].strip()
+    )
+    parser.add_argument('project', choices=sorted(PROJECTS))
+    parser.add_argument('--url', help='Адрес запущенного сервера.')
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--users', type=int, default=8)
+    parser.add_argument('--scale', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help='Куда сохранить результат в JSON.')
+    parser.add_argument('--compare', help='JSON прошлого прогона.')
+    args = parser.parse_args()
+
+    database_dir = setup_django(args.project, args.url)
+    rng = random.Random(args.seed)
+    scenario = SCENARIOS[args.project](rng)
+    users = scenario.seed(args.scale, args.users)
+    server, base_url = (None, args.url) if args.url else start_server(
+        args.project
+    )
+
+    results = []
+    deadline = time.monotonic() + args.duration
+    workers = [
+        threading.Thread(target=run_user, args=(
+            scenario, user, base_url, deadline, args.seed + number, results
+        ))
+        for number, user in enumerate(users)
+    ]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    duration = time.perf_counter() - started
+    if server:
+        server.shutdown()
+        server.server_close()
+    if database_dir:
+        from django.db import connections
+
+        connections.close_all()
+        database_dir.cleanup()
+
+    summary = summarize(results, duration)
+    previous = None
+    if args.compare:
+        previous = json.loads(Path(args.compare).read_text())['routes']
+    print_summary(summary, previous)
+    total = sum(stats['requests'] for stats in summary.values())
+    print(f'Всего: {total} запросов за {duration:.1f} с, '
+          f'{total / duration:.1f} в секунду')
+    if args.out:
+        Path(args.out).write_text(json.dumps({
+            'project': args.project,
+            'config': {
+                key: getattr(args, key)
+                for key in ('url', 'duration', 'users', 'scale', 'seed')
+            },
+            'duration': duration,
+            'routes': summary,
+        }, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+"""
+Параллельный прогон проверок и тестов YaNews и YaNote.
+
+Запускает одновременно flake8, structure_test.py и тесты обоих
+проектов, причём тесты каждого проекта делятся на части по отдельным
+процессам pytest. У каждого процесса своя тестовая база SQLite
+(pytest-django создаёт её в памяти процесса) и свой каталог временных
+файлов, поэтому общих файлов у частей нет. Результаты собираются из
+JUnit XML в один отчёт с временем каждого теста.
+
+    python parallel_tests.py
+    python parallel_tests.py --workers 4 --slowest 20 --out report.json
+
+Части набираются по времени тестов из прошлого прогона
+(.test_durations.json), чтобы они заканчивались примерно одновременно.
+Тесты одного класса всегда попадают в одну часть: так setUpTestData
+выполняется один раз.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+
+PROJECTS = {
+    'news': ('ya_news', 'yanews.settings'),
+    'note': ('ya_note', 'yanote.settings'),
+}
+
+CHECKS = {
+    'flake8': [sys.executable, '-m', 'flake8', '--config=setup.cfg'],
+    'structure': [sys.executable, 'structure_test.py'],
+}
+
+DURATIONS = BASE_DIR / '.test_durations.json'
+
+# Время теста, которого нет в файле длительностей.
+DEFAULT_DURATION = 0.05
+
+# pytest: тесты не найдены. Для части это не ошибка.
+NO_TESTS = 5
+
+
+def collect(project):
+    """Node id всех тестов проекта."""
+    directory, settings = PROJECTS[project]
+    output = subprocess.run(
+        [sys.executable, '-m', 'pytest', '--collect-only', '-q',
+         '-o', 'addopts=-p no:cacheprovider'],
+        cwd=BASE_DIR / directory, env=project_env(settings),
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return [line for line in output.splitlines() if '::' in line]
+
+
+def project_env(settings, tmp_dir=None):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings)
+    if tmp_dir is not None:
+        env.update(TMPDIR=str(tmp_dir), TEMP=str(tmp_dir), TMP=str(tmp_dir))
+    return env
+
+
+def group_key(node_id):
+    """Файл для функций, файл и класс для тестов-классов."""
+    return '::'.join(node_id.split('::')[:-1]) or node_id
+
+
+def make_groups(project, node_ids, durations):
+    groups = {}
+    for node_id in node_ids:
+        tests, cost = groups.get(group_key(node_id), ([], 0))
+        cost += durations.get(f'{project}:{node_id}', DEFAULT_DURATION)
+        groups[group_key(node_id)] = (tests + [node_id], cost)
+    return list(groups.values())
+
+
+def split(groups, shards):
+    """Жадно раскладывает группы по частям: самые долгие первыми."""
+    parts = [([], 0) for _ in range(shards)]
+    for tests, cost in sorted(groups, key=lambda group: -group[1]):
+        index = min(range(shards), key=lambda number: parts[number][1])
+        part_tests, part_cost = parts[index]
+        parts[index] = (part_tests + tests, part_cost + cost)
+    return [tests for tests, _ in parts if tests]
+
+
+def plan(workers, durations):
+    """Части тестов каждого проекта.
+
+    Процессы делятся между проектами пропорционально времени их тестов.
+    """
+    groups = {
+        project: make_groups(project, collect(project), durations)
+        for project in PROJECTS
+    }
+    costs = {
+        project: sum(cost for _, cost in project_groups)
+        for project, project_groups in groups.items()
+    }
+    total = sum(costs.values()) or 1
+    return {
+        project: split(
+            groups[project], max(1, round(workers * costs[project] / total))
+        )
+        for project in PROJECTS
+    }
+
+
+class Job:
+    """Один процесс: проверка или часть тестов проекта."""
+
+    def __init__(self, name, command, cwd, env, work_dir, junit=None):
+        self.name, self.junit = name, junit
+        self.log = work_dir / f'{name}.log'
+        with open(self.log, 'w') as log:
+            self.process = subprocess.Popen(
+                command, cwd=cwd, env=env,
+                stdout=log, stderr=subprocess.STDOUT,
+            )
+
+    def wait(self):
+        self.returncode = self.process.wait()
+        return self
+
+    @property
+    def failed(self):
+        allowed = (0, NO_TESTS) if self.junit else (0,)
+        return self.returncode not in allowed
+
+    def output(self):
+        return self.log.read_text()
+
+
+def start_shard(project, number, node_ids, work_dir):
+    directory, settings = PROJECTS[project]
+    name = f'{project}-{number}'
+    tmp_dir = work_dir / name
+    tmp_dir.mkdir()
+    junit = work_dir / f'{name}.xml'
+    command = [
+        sys.executable, '-m', 'pytest', '-q', '--tb=short',
+        '-o', 'addopts=-p no:cacheprovider', '-o', 'junit_family=xunit1',
+        f'--junitxml={junit}', *node_ids,
+    ]
+    return Job(
+        name, command, BASE_DIR / directory,
+        project_env(settings, tmp_dir), work_dir, junit,
+    )
+
+
+def node_id(case):
+    """Восстанавливает node id pytest из записи xunit1."""
+    path = case.get('file', '')
+    module = path[:-len('.py')].replace('/', '.')
+    classname = case.get('classname', '')
+    parts = [path]
+    if classname != module:
+        parts.append(classname[len(module) + 1:])
+    parts.append(case.get('name', ''))
+    return '::'.join(parts)
+
+
+def case_outcome(case):
+    for tag in ('failure', 'error', 'skipped'):
+        element = case.find(tag)
+        if element is not None:
+            return tag, element.get('message', '')
+    return 'passed', ''
+
+
+def read_results(project, job):
+    if not job.junit.exists():
+        return []
+    results = []
+    for case in ET.parse(job.junit).iter('testcase'):
+        outcome, message = case_outcome(case)
+        results.append({
+            'project': project,
+            'shard': job.name,
+            'test': node_id(case),
+            'outcome': outcome,
+            'message': message,
+            'time': float(case.get('time', 0)),
+        })
+    return results
+
+
+def load_durations(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(path, results):
+    durations = load_durations(path)
+    durations.update({
+        f'{result["project"]}:{result["test"]}': result['time']
+        for result in results
+    })
+    with open(path, 'w') as file:
+        json.dump(durations, file, indent=2, sort_keys=True)
+
+
+def run(shards):
+    """Запускает проверки и части тестов, ждёт их и собирает итоги."""
+    with tempfile.TemporaryDirectory() as directory:
+        work_dir = Path(directory)
+        checks = [
+            Job(name, command, BASE_DIR, dict(os.environ), work_dir)
+            for name, command in CHECKS.items()
+        ]
+        tests = [
+            (project, start_shard(project, number, node_ids, work_dir))
+            for project, parts in shards.items()
+            for number, node_ids in enumerate(parts, 1)
+        ]
+        results = []
+        for project, job in tests:
+            results.extend(read_results(project, job.wait()))
+        failed = [job for job in checks if job.wait().failed] + [
+            job for _, job in tests if job.failed
+        ]
+        return results, {job.name: job.output() for job in failed}
+
+
+def print_summary(shards, results, outputs, wall, slowest):
+    for name, output in outputs.items():
+        print(f'===== {name} =====')
+        print(output.rstrip())
+    for project, parts in shards.items():
+        counts = {}
+        for result in results:
+            if result['project'] == project:
+                counts[result['outcome']] = counts.get(
+                    result['outcome'], 0
+                ) + 1
+        total = sum(
+            result['time'] for result in results
+            if result['project'] == project
+        )
+        print(
+            f'{project}: частей {len(parts)}, '
+            + ', '.join(f'{key} {value}' for key, value in
+                        sorted(counts.items()))
+            + f', время тестов {total:.2f} с'
+        )
+    if slowest:
+        print(f'Самые долгие тесты ({slowest}):')
+        for result in sorted(results, key=lambda item: -item['time'])[
+            :slowest
+        ]:
+            print(
+                f'{result["time"]:8.3f} с  {result["project"]}  '
+                f'{result["test"]}'
+            )
+    print(f'Всего {len(results)} тестов за {wall:.2f} с')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Сколько процессов pytest запускать.')
+    parser.add_argument('--slowest', type=int, default=10,
+                        help='Сколько самых долгих тестов показать.')
+    parser.add_argument('--durations', type=Path, default=DURATIONS,
+                        help='Файл с временем тестов прошлых прогонов.')
+    parser.add_argument('--out', type=Path,
+                        help='Сохранить отчёт со временем тестов в JSON.')
+    options = parser.parse_args()
+
+    started = time.perf_counter()
+    shards = plan(options.workers, load_durations(options.durations))
+    results, outputs = run(shards)
+    wall = time.perf_counter() - started
+    save_durations(options.durations, results)
+    print_summary(shards, results, outputs, wall, options.slowest)
+    if options.out:
+        with open(options.out, 'w') as file:
+            json.dump(
+                {'wall': wall, 'failed': sorted(outputs), 'tests': results},
+                file, indent=2, ensure_ascii=False,
+            )
+    return 1 if outputs else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,15 +1,140 @@
+from django.conf import settings
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.forms.models import BaseInlineFormSet
+from django.urls import reverse
+from django.utils.functional import cached_property
+from django.utils.html import format_html
 
+from .cache import HOME, bump_versions
 from .models import Comment, News
+from .moderation import set_status
+from .search import COMMENT, NEWS, filter_matching
 
 
-class CommentInline(admin.StackedInline):
+class CappedPaginator(Paginator):
+    """
+    Пагинатор, который считает строки не дальше ADMIN_COUNT_LIMIT.
+
+    COUNT(*) по миллионам комментариев дольше самой страницы, а
+    листать дальше нескольких тысяч строк в админке незачем: нужную
+    строку находят поиском или фильтром.
+    """
+
+    @cached_property
+    def count(self):
+        return self.object_list[:settings.ADMIN_COUNT_LIMIT].count()
+
+
+class LatestCommentsFormSet(BaseInlineFormSet):
+
+    def get_queryset(self):
+        # Срез кешируется так же, как queryset у родителя: иначе каждая
+        # форма набора перечитывала бы его заново.
+        if not hasattr(self, '_queryset'):
+            self._queryset = super().get_queryset()[
+                :settings.ADMIN_INLINE_COMMENTS
+            ]
+        return self._queryset
+
+
+class CommentInline(admin.TabularInline):
+    """Последние комментарии новости, только для чтения."""
     model = Comment
+    formset = LatestCommentsFormSet
+    fields = readonly_fields = ('author', 'text', 'created', 'status')
+    ordering = ('-id',)
     extra = 0
+    can_delete = False
+    show_change_link = True
+    verbose_name_plural = 'Последние комментарии'
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('author')
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+class SearchIndexMixin:
+    """Поиск в списке по индексу FTS5 вместо LIKE по всей таблице."""
+    search_kind = None
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return filter_matching(queryset, search_term, self.search_kind), False
 
 
 @admin.register(News)
-class NewsAdmin(admin.ModelAdmin):
+class NewsAdmin(SearchIndexMixin, admin.ModelAdmin):
+    list_display = ('title', 'date', 'comment_count')
+    ordering = ('-date', '-id')
+    readonly_fields = ('comment_count', 'all_comments')
+    # Поиск идёт через get_search_results, поле нужно для строки поиска.
+    search_fields = ('title',)
+    search_kind = NEWS
+    paginator = CappedPaginator
+    show_full_result_count = False
     inlines = [
         CommentInline,
     ]
+
+    @admin.display(description='Все комментарии')
+    def all_comments(self, news):
+        if news.pk is None:
+            return '—'
+        url = reverse('admin:news_comment_changelist')
+        return format_html(
+            '<a href="{}?news__id__exact={}">Открыть список ({})</a>',
+            url, news.pk, news.comment_count,
+        )
+
+
+@admin.register(Comment)
+class CommentAdmin(SearchIndexMixin, admin.ModelAdmin):
+    list_display = ('__str__', 'news', 'author', 'created', 'status')
+    list_filter = ('status',)
+    list_select_related = ('news', 'author')
+    raw_id_fields = ('news', 'author')
+    ordering = ('-id',)
+    search_fields = ('text',)
+    search_kind = COMMENT
+    paginator = CappedPaginator
+    show_full_result_count = False
+    actions = ('approve', 'reject')
+
+    @admin.action(description='Одобрить выбранные комментарии')
+    def approve(self, request, queryset):
+        changed = set_status(queryset, Comment.Status.APPROVED)
+        self.message_user(request, f'Одобрено комментариев: {changed}')
+
+    @admin.action(description='Отклонить выбранные комментарии')
+    def reject(self, request, queryset):
+        changed = set_status(queryset, Comment.Status.REJECTED)
+        self.message_user(request, f'Отклонено комментариев: {changed}')
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        self.recount({obj.news_id, form.initial.get('news', obj.news_id)})
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        self.recount({obj.news_id})
+
+    def delete_queryset(self, request, queryset):
+        news_ids = set(queryset.values_list('news_id', flat=True))
+        super().delete_queryset(request, queryset)
+        self.recount(news_ids)
+
+    @staticmethod
+    def recount(news_ids):
+        """
+        Пересчитывает счётчики и сбрасывает закешированные страницы.
+
+        recount_comments() идёт через update() и сигналов News не
+        вызывает, поэтому версии сдвигаются явно, как в set_status.
+        """
+        News.objects.filter(pk__in=news_ids).recount_comments()
+        if news_ids:
+            bump_versions(*news_ids, HOME)
@@ -0,0 +1,103 @@
+import hashlib
+
+from django.conf import settings
+from django.db.models import Count, Max, OuterRef, Subquery, Sum
+from django.http import Http404, JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views import generic
+
+from .models import Comment, News
+from .pagination import get_comments_page
+
+
+class ConditionalJsonView(generic.View):
+    """
+    JSON с ETag и Last-Modified.
+
+    get_validators() возвращает значения, от которых зависит ответ, и
+    время последнего изменения. Они должны стоить агрегирующего запроса
+    без загрузки строк: если версия у клиента актуальна, он получает 304
+    ещё до выборки и сериализации данных из get_data().
+    """
+
+    def get_validators(self):
+        raise NotImplementedError
+
+    def get_data(self):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        state, last_modified = self.get_validators()
+        etag = quote_etag(hashlib.md5(repr(state).encode()).hexdigest())
+        last_modified = last_modified and int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        ) or JsonResponse(self.get_data())
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class NewsFeed(ConditionalJsonView):
+    """Последние новости, как на главной."""
+
+    def get_news(self):
+        return News.objects.all()[:settings.NEWS_COUNT_ON_HOME_PAGE]
+
+    def get_validators(self):
+        top = self.get_news().values('pk')
+        state = News.objects.filter(pk__in=Subquery(top)).aggregate(
+            count=Count('pk'),
+            ids=Sum('pk'),
+            comments=Sum('comment_count'),
+            updated=Max('updated'),
+        )
+        last_comment = Comment.objects.filter(
+            news__in=Subquery(top)
+        ).aggregate(created=Max('created'))['created']
+        return state, max(filter(None, (state['updated'], last_comment)),
+                          default=None)
+
+    def get_data(self):
+        return {'results': list(self.get_news().values(
+            'id', 'title', 'text', 'date', 'comment_count'
+        ))}
+
+
+class CommentsFeed(ConditionalJsonView):
+    """Страница комментариев к новости с курсором следующей."""
+
+    def get_validators(self):
+        newest = Comment.objects.filter(
+            news=OuterRef('pk')
+        ).order_by('-updated').values('updated')[:1]
+        state = News.objects.filter(pk=self.kwargs['pk']).values_list(
+            'comment_count', 'updated'
+        ).annotate(last_comment=Subquery(newest)).first()
+        if state is None:
+            raise Http404('Новость не найдена.')
+        # updated новости сдвигается при каждом изменении счётчика,
+        # поэтому Last-Modified не уходит назад, когда удалён последний
+        # комментарий.
+        _, news_updated, last_comment = state
+        return state, max(filter(None, (news_updated, last_comment)))
+
+    def get_data(self):
+        comments, next_cursor = get_comments_page(
+            self.kwargs['pk'], self.request.GET.get('after')
+        )
+        return {
+            'news': self.kwargs['pk'],
+            'results': [
+                {
+                    'id': comment.id,
+                    'author': comment.author.username,
+                    'text': comment.text,
+                    'created': comment.created,
+                }
+                for comment in comments
+            ],
+            'next_cursor': next_cursor,
+        }
@@ -0,0 +1,49 @@
+import time
+from contextlib import contextmanager
+
+
+@contextmanager
+def explicit_timestamps(model):
+    """
+    Временно отключает auto_now и auto_now_add у полей модели.
+
+    bulk_create иначе перезаписывает даты текущим временем, а при
+    импорте и генерации данных их нужно сохранить как есть.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Progress:
+    """Пишет в поток число обработанных строк и скорость обработки."""
+
+    def __init__(self, stream, every=100_000):
+        self.stream = stream
+        self.every = every
+        self.count = 0
+        self.started = time.perf_counter()
+        self._next_report = every
+
+    @property
+    def rate(self):
+        return self.count / max(time.perf_counter() - self.started, 1e-9)
+
+    def add(self, count=1):
+        self.count += count
+        if self.count >= self._next_report:
+            self._next_report += self.every
+            self.report()
+
+    def report(self):
+        self.stream.write(f'{self.count} строк, {self.rate:.0f} строк/с')
@@ -0,0 +1,71 @@
+import hashlib
+import time
+
+from django.core.cache import caches
+from django.http import HttpResponse
+
+CACHE_ALIAS = 'news'
+HOME = 'home'
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def _version_key(name):
+    return f'news:version:{name}'
+
+
+def get_version(name):
+    """
+    Возвращает текущую версию данных новости (или главной страницы).
+
+    Версия входит в ключи кеша: после её смены старые записи больше
+    не читаются и просто вытесняются бэкендом.
+    """
+    cache = get_cache()
+    key = _version_key(name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_versions(*names):
+    """Сбрасывает версии, чтобы закешированные страницы устарели."""
+    get_cache().delete_many([_version_key(name) for name in names])
+
+
+class AnonymousPageCacheMixin:
+    """
+    Кеширует страницу целиком для анонимных пользователей.
+
+    Ключ состоит из адреса страницы и версий из get_cache_versions().
+    """
+
+    def get_cache_versions(self):
+        raise NotImplementedError
+
+    def get_page_cache_key(self):
+        path = hashlib.md5(
+            self.request.get_full_path().encode()
+        ).hexdigest()
+        versions = ':'.join(
+            str(get_version(name)) for name in self.get_cache_versions()
+        )
+        return f'news:page:{path}:{versions}'
+
+    def get(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().get(request, *args, **kwargs)
+        cache = get_cache()
+        key = self.get_page_cache_key()
+        content = cache.get(key)
+        if content is not None:
+            return HttpResponse(content)
+        response = super().get(request, *args, **kwargs)
+        response.add_post_render_callback(
+            lambda response: cache.set(key, response.content)
+        )
+        return response
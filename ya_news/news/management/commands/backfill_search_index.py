@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from news.search import COMMENT, NEWS, backfill
+
+
+class Command(BaseCommand):
+    help = 'Добавляет в поисковый индекс существующие новости и комментарии.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        for kind in (NEWS, COMMENT):
+            total = 0
+            for total in backfill(kind, options['batch_size']):
+                self.stdout.write(f'{kind}: {total}')
+            self.stdout.write(
+                self.style.SUCCESS(f'{kind}: проиндексировано {total}')
+            )
@@ -0,0 +1,81 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from news.models import News
+from news.synthetic import generate
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет страницы админки новостей и комментариев на больших '
+        'объёмах: по умолчанию 100 тысяч пользователей и новость с '
+        'десятками тысяч комментариев. Данные создаются внутри '
+        'транзакции и откатываются. С --limit-ms медиана любой страницы '
+        'выше порога завершает команду ошибкой.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100_000)
+        parser.add_argument('--news', type=int, default=100)
+        parser.add_argument('--comments', type=int, default=100_000)
+        parser.add_argument('--requests', type=int, default=5)
+        parser.add_argument('--limit-ms', type=float)
+
+    def handle(self, *args, **options):
+        with transaction.atomic(), override_settings(
+            ALLOWED_HOSTS=['testserver']
+        ):
+            generate(options['users'], options['news'], options['comments'])
+            client = Client()
+            client.force_login(get_user_model().objects.create_superuser(
+                'bench-admin', password=None
+            ))
+            results = [
+                (name, self.measure(client, url, data, options))
+                for name, url, data in self.cases()
+            ]
+            transaction.set_rollback(True)
+
+        slow = []
+        for name, timings in results:
+            median = statistics.median(timings)
+            self.stdout.write(
+                f'{name:<32} p50 {median:8.1f} мс, '
+                f'макс. {max(timings):8.1f} мс'
+            )
+            if options['limit_ms'] and median > options['limit_ms']:
+                slow.append(name)
+        if slow:
+            raise CommandError(f'Медиана выше порога: {", ".join(slow)}')
+
+    def cases(self):
+        news = News.objects.order_by('-comment_count').first()
+        comment = news.comment_set.order_by('-id').first()
+        comments = reverse('admin:news_comment_changelist')
+        return (
+            ('Список новостей',
+             reverse('admin:news_news_changelist'), None),
+            (f'Новость, {news.comment_count} комментариев',
+             reverse('admin:news_news_change', args=(news.pk,)), None),
+            ('Список комментариев', comments, None),
+            ('Комментарии новости', comments, {'news__id__exact': news.pk}),
+            ('Поиск по комментариям', comments, {'q': 'город'}),
+            ('Комментарий',
+             reverse('admin:news_comment_change', args=(comment.pk,)), None),
+        )
+
+    def measure(self, client, url, data, options):
+        timings = []
+        for _ in range(options['requests']):
+            started = time.perf_counter()
+            response = client.get(url, data)
+            timings.append((time.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            raise CommandError(f'{url}: ответ {response.status_code}')
+        return timings
@@ -0,0 +1,65 @@
+import random
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from news.moderation import WordMatcher
+
+ALPHABET = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+
+
+def naive_search(words, text):
+    """Прежняя проверка из CommentForm.clean_text."""
+    lowered_text = text.lower()
+    for word in words:
+        if word in lowered_text:
+            return word
+    return None
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает поиск запрещённых слов циклом и автоматом '
+        'Ахо — Корасик на словарях разного размера.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=(10, 1000, 10000)
+        )
+        parser.add_argument('--text-length', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        text = ''.join(
+            rng.choice(ALPHABET + ' ') for _ in range(options['text_length'])
+        )
+        self.stdout.write(
+            f'{"слов":>8} {"цикл, мс":>10} {"автомат, мс":>12} '
+            f'{"сборка, мс":>11} {"ускорение":>10}'
+        )
+        for size in options['sizes']:
+            # Слова длиннее случайных совпадений в тексте: ни одно
+            # не найдётся, и обе реализации проверяют текст целиком.
+            words = [
+                ''.join(
+                    rng.choice(ALPHABET) for _ in range(rng.randint(8, 14))
+                )
+                for _ in range(size)
+            ]
+            build = min(timeit.repeat(
+                lambda: WordMatcher(words), number=1, repeat=3
+            ))
+            matcher = WordMatcher(words)
+            naive = self.measure(lambda: naive_search(words, text), options)
+            compiled = self.measure(lambda: matcher.search(text), options)
+            self.stdout.write(
+                f'{size:>8} {naive * 1000:>10.3f} {compiled * 1000:>12.3f} '
+                f'{build * 1000:>11.1f} {naive / compiled:>9.1f}x'
+            )
+
+    @staticmethod
+    def measure(func, options):
+        return min(timeit.repeat(func, number=1, repeat=options['repeat']))
@@ -0,0 +1,74 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from news.models import Comment, News
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает стоимость ответа 304 по ETag с полной отрисовкой '
+        'HTML и JSON для главной и комментариев. Данные создаются внутри '
+        'транзакции и откатываются после замеров.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--news', type=int, default=100)
+        parser.add_argument('--comments', type=int, default=200)
+        parser.add_argument('--requests', type=int, default=300)
+
+    def handle(self, *args, **options):
+        with transaction.atomic(), override_settings(
+            ALLOWED_HOSTS=['testserver']
+        ):
+            user = get_user_model().objects.create(username='bench-feed')
+            News.objects.bulk_create(
+                News(title=f'Новость {index}', text='Текст новости. ' * 50)
+                for index in range(options['news'])
+            )
+            news = News.objects.first()
+            Comment.objects.bulk_create(
+                Comment(news=news, author=user, text='Комментарий. ' * 10)
+                for _ in range(options['comments'])
+            )
+            News.objects.recount_comments()
+
+            client = Client()
+            cases = (
+                ('Главная, HTML', reverse('news:home'), False),
+                ('Главная, JSON', reverse('news:api_news'), False),
+                ('Главная, 304', reverse('news:api_news'), True),
+                ('Новость, HTML', reverse('news:detail', args=(news.pk,)),
+                 False),
+                ('Комментарии, JSON',
+                 reverse('news:api_comments', args=(news.pk,)), False),
+                ('Комментарии, 304',
+                 reverse('news:api_comments', args=(news.pk,)), True),
+            )
+            results = [
+                (name, self.measure(client, url, conditional, options))
+                for name, url, conditional in cases
+            ]
+            transaction.set_rollback(True)
+
+        for name, timings in results:
+            self.stdout.write(
+                f'{name:<20} p50 {statistics.median(timings):7.2f} мс, '
+                f'среднее {statistics.fmean(timings):7.2f} мс'
+            )
+
+    def measure(self, client, url, conditional, options):
+        headers = {}
+        if conditional:
+            headers['HTTP_IF_NONE_MATCH'] = client.get(url)['ETag']
+        timings = []
+        for _ in range(options['requests']):
+            started = time.perf_counter()
+            client.get(url, **headers)
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
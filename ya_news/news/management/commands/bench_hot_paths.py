@@ -0,0 +1,119 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+
+from news.forms import CommentForm
+from news.models import Comment, News
+from news.moderation import score
+from news.pagination import CommentsPage
+from yanews.microbench import compare, load_baseline, measure, save_baseline
+
+BASELINE = settings.BASE_DIR / 'benchmarks' / 'hot_paths.json'
+
+
+class Command(BaseCommand):
+    help = (
+        'Микробенчмарки горячих мест: проверка пачки комментариев '
+        'правилами модерации и '
+        'отрисовка главной и страницы новости. С --save результат '
+        'становится базовым, с --check замедление больше порога '
+        'относительно базового завершает команду ошибкой. Базовый файл '
+        'записан на одной машине: на другой его стоит перезаписать.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--baseline', default=BASELINE)
+        parser.add_argument('--save', action='store_true')
+        parser.add_argument('--check', action='store_true')
+        parser.add_argument('--threshold', type=float, default=0.25)
+        parser.add_argument('--min-delta', type=float, default=0.05,
+                            help='Меньшие замедления, мс, не в счёт.')
+        parser.add_argument('--comments', type=int, default=100,
+                            help='Комментариев к каждой новости главной.')
+        parser.add_argument('--rounds', type=int, default=15)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            results = {
+                name: measure(case, options['rounds'])
+                for name, case in self.cases(options).items()
+            }
+            transaction.set_rollback(True)
+
+        lines, regressions = compare(
+            results, load_baseline(options['baseline']),
+            options['threshold'], options['min_delta'],
+        )
+        for line in lines:
+            self.stdout.write(line)
+        if options['save']:
+            save_baseline(options['baseline'], results)
+            self.stdout.write(f'Базовые значения: {options["baseline"]}')
+        if options['check'] and regressions:
+            raise CommandError(
+                'Замедлились больше чем на '
+                f'{options["threshold"]:.0%} и {options["min_delta"]} мс: '
+                f'{", ".join(regressions)}'
+            )
+
+    def cases(self, options):
+        author = get_user_model().objects.create(username='bench-hot-paths')
+        request = RequestFactory().get('/')
+        request.user = author
+
+        # Пачка длинных комментариев: 50 по 2000 символов, 100k текста.
+        batch = [
+            Comment(text='Обычный комментарий без запрещённых слов. ' * 50)
+            for _ in range(50)
+        ]
+
+        def score_batch():
+            assert not any(score(batch))
+
+        News.objects.bulk_create(
+            News(title=f'Новость {number}', text='Текст новости. ' * 50)
+            for number in range(settings.NEWS_COUNT_ON_HOME_PAGE)
+        )
+        Comment.objects.bulk_create(
+            Comment(news=news, author=author, text='Комментарий. ' * 5)
+            for news in News.objects.all()
+            for _ in range(options['comments'])
+        )
+        News.objects.recount_comments()
+        news_list = list(
+            News.objects.all()[:settings.NEWS_COUNT_ON_HOME_PAGE]
+        )
+
+        def render_home():
+            render_to_string(
+                'news/home.html', {'object_list': news_list}, request
+            )
+
+        detail_news = News.objects.create(title='Обсуждаемая', text='Текст')
+        Comment.objects.bulk_create(
+            Comment(news=detail_news, author=author, text='Комментарий. ' * 5)
+            for _ in range(1000)
+        )
+        # Комментарии выбираются заранее: замеряется только отрисовка.
+        page = CommentsPage(detail_news.pk, limit=1000)
+        page.comments
+        detail_context = {
+            'news': detail_news,
+            'object': detail_news,
+            'comments_page': page,
+            'comments_version': 0,
+            'form': CommentForm(),
+            'view': {'kwargs': {'pk': detail_news.pk}},
+        }
+
+        def render_detail():
+            render_to_string('news/detail.html', detail_context, request)
+
+        return {
+            'moderation_score_50x2k': score_batch,
+            f'render_home_10x{options["comments"]}': render_home,
+            'render_detail_1000': render_detail,
+        }
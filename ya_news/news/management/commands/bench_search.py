@@ -0,0 +1,90 @@
+import itertools
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from news.models import Comment, News
+from news.search import search
+
+ALPHABET = 'абвгдежзийклмнопрстуфхцчшщэюя'
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет задержку поиска на синтетическом корпусе. Данные '
+        'создаются внутри транзакции и откатываются после замеров.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--comments', type=int, default=1_000_000)
+        parser.add_argument('--news', type=int, default=10_000)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        vocabulary = [
+            ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(3, 10)))
+            for _ in range(50_000)
+        ]
+        # Частоты слов по закону Ципфа, как в естественном тексте.
+        cum_weights = list(itertools.accumulate(
+            1 / rank for rank in range(1, len(vocabulary) + 1)
+        ))
+
+        def sentence(length):
+            return ' '.join(
+                rng.choices(vocabulary, cum_weights=cum_weights, k=length)
+            )
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            user = get_user_model().objects.create(username='bench-search')
+            news = News.objects.bulk_create(
+                News(title=sentence(4)[:50], text=sentence(40))
+                for _ in range(options['news'])
+            )
+            news_ids = list(News.objects.values_list('id', flat=True))
+            for start in range(0, options['comments'], options['batch_size']):
+                size = min(options['batch_size'], options['comments'] - start)
+                Comment.objects.bulk_create(
+                    Comment(
+                        news_id=rng.choice(news_ids),
+                        author=user,
+                        text=sentence(rng.randint(5, 30)),
+                    )
+                    for _ in range(size)
+                )
+            self.stdout.write(
+                f'Корпус: {len(news)} новостей, {options["comments"]} '
+                f'комментариев за {time.perf_counter() - started:.1f} с'
+            )
+
+            frequent_words = vocabulary[:5000]
+            queries = [
+                ' '.join(
+                    word[:rng.randint(2, len(word))]
+                    for word in rng.choices(
+                        frequent_words, k=rng.randint(1, 2)
+                    )
+                )
+                for _ in range(options['queries'])
+            ]
+            timings = []
+            for query in queries:
+                started = time.perf_counter()
+                search(query)
+                timings.append((time.perf_counter() - started) * 1000)
+            transaction.set_rollback(True)
+
+        percentiles = statistics.quantiles(timings, n=100)
+        self.stdout.write(
+            f'Запросов: {len(timings)}; p50 {percentiles[49]:.2f} мс, '
+            f'p95 {percentiles[94]:.2f} мс, p99 {percentiles[98]:.2f} мс, '
+            f'max {max(timings):.2f} мс'
+        )
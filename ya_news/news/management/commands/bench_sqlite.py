@@ -0,0 +1,83 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, transaction
+from django.db.models import F
+
+from news.models import Comment, News
+from news.pagination import get_comments_page
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагружает таблицы новостей и комментариев параллельными чтениями '
+        'и записями. Запустите с SQLITE_PROFILE=default и '
+        'SQLITE_PROFILE=production, чтобы сравнить профили.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=16)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--seconds', type=float, default=10)
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.create(
+            username=f'bench-sqlite-{time.time_ns()}'
+        )
+        news = News.objects.create(title='Bench', text='Bench')
+        self.stop = threading.Event()
+        self.lock = threading.Lock()
+        self.stats = {'read': 0, 'write': 0, 'error': 0}
+        threads = [
+            threading.Thread(target=self.run, args=(self.read, news))
+            for _ in range(options['readers'])
+        ] + [
+            threading.Thread(target=self.run, args=(self.write, news, user))
+            for _ in range(options['writers'])
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            time.sleep(options['seconds'])
+        finally:
+            self.stop.set()
+            for thread in threads:
+                thread.join()
+            news.delete()
+            user.delete()
+
+        seconds = options['seconds']
+        self.stdout.write(f'Профиль: {settings.SQLITE_PROFILE}')
+        for name, count in self.stats.items():
+            self.stdout.write(
+                f'{name:>6}: {count:>8} ({count / seconds:.1f} в секунду)'
+            )
+
+    def run(self, operation, *args):
+        try:
+            while not self.stop.is_set():
+                try:
+                    operation(*args)
+                    name = operation.__name__
+                except OperationalError:
+                    name = 'error'
+                with self.lock:
+                    self.stats[name] += 1
+        finally:
+            connection.close()
+
+    @staticmethod
+    def read(news):
+        list(News.objects.all()[:settings.NEWS_COUNT_ON_HOME_PAGE])
+        get_comments_page(news.pk)
+
+    @staticmethod
+    def write(news, user):
+        with transaction.atomic():
+            Comment.objects.create(news=news, author=user, text='Bench')
+            News.objects.filter(pk=news.pk).update(
+                comment_count=F('comment_count') + 1
+            )
@@ -0,0 +1,56 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from news.bulk import Progress
+from news.models import Comment, News
+
+EXPORTS = (
+    ('news.news', News, ('title', 'text', 'date', 'updated')),
+    (
+        'news.comment',
+        Comment,
+        ('news', 'author', 'text', 'created', 'updated', 'status'),
+    ),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает новости и комментарии в JSON Lines: по одной записи '
+        'в строке в формате фикстур Django. Пользователи не выгружаются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл или - для stdout.')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if options['path'] == '-':
+            self.export(self.stdout, options)
+            return
+        with open(options['path'], 'w', encoding='utf-8') as file:
+            self.export(file, options)
+
+    def export(self, file, options):
+        progress = Progress(self.stderr)
+        # В отличие от DjangoJSONEncoder isoformat() не отбрасывает
+        # микросекунды, а по ним сортируются комментарии.
+        encoder = json.JSONEncoder(
+            ensure_ascii=False, default=lambda value: value.isoformat()
+        )
+        for label, model, fields in EXPORTS:
+            columns = [
+                model._meta.get_field(name).attname for name in fields
+            ]
+            rows = model.objects.order_by('pk').values_list(
+                'pk', *columns
+            ).iterator(chunk_size=options['chunk_size'])
+            for pk, *values in rows:
+                file.write(encoder.encode({
+                    'model': label,
+                    'pk': pk,
+                    'fields': dict(zip(fields, values)),
+                }) + '\n')
+                progress.add()
+        progress.report()
@@ -0,0 +1,54 @@
+from argparse import ArgumentTypeError
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from news.bulk import Progress
+from news.synthetic import generate
+
+
+def parse_moment(value):
+    moment = parse_datetime(value)
+    if moment is None:
+        raise ArgumentTypeError(f'Некорректная дата: {value}')
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими пользователями, новостями и '
+        'комментариями для проверки масштабирования. Число комментариев '
+        'у новостей распределено по закону Ципфа, результат определяется '
+        '--seed и --now. Строки дописываются к существующим.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--news', type=int, default=100_000)
+        parser.add_argument('--comments', type=int, default=10_000_000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--skew', type=float, default=1.0,
+                            help='Показатель распределения Ципфа.')
+        parser.add_argument('--batch-size', type=int, default=10_000,
+                            help='Строк в одной транзакции.')
+        parser.add_argument('--now', type=parse_moment,
+                            help='Момент ISO 8601, до которого идут даты; '
+                                 'по умолчанию текущий.')
+
+    def handle(self, *args, **options):
+        progress = Progress(self.stderr)
+        generated = generate(
+            options['users'], options['news'], options['comments'],
+            seed=options['seed'], skew=options['skew'],
+            batch_size=options['batch_size'], on_batch=progress.add,
+            now=options['now'],
+        )
+        progress.report()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пользователей: {len(generated.users)}, '
+            f'новостей: {len(generated.news)}, '
+            f'комментариев: {generated.comments}'
+        ))
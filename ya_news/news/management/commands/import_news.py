@@ -0,0 +1,100 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from news.bulk import Progress, explicit_timestamps
+from news.models import Comment, News
+
+
+def build_news(pk, fields):
+    return News(
+        pk=pk,
+        title=fields['title'],
+        text=fields['text'],
+        date=parse_date(fields['date']),
+        # В выгрузках старых версий времени изменения нет.
+        updated=(
+            parse_datetime(fields['updated']) if 'updated' in fields
+            else timezone.now()
+        ),
+    )
+
+
+def build_comment(pk, fields):
+    return Comment(
+        pk=pk,
+        news_id=fields['news'],
+        author_id=fields['author'],
+        text=fields['text'],
+        created=parse_datetime(fields['created']),
+        updated=parse_datetime(fields.get('updated') or fields['created']),
+        # До модерации все комментарии показывались.
+        status=fields.get('status', Comment.Status.APPROVED),
+    )
+
+
+BUILDERS = {
+    'news.news': (News, build_news),
+    'news.comment': (Comment, build_comment),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает новости и комментарии из JSON Lines, созданного '
+        'export_news. Авторы комментариев должны уже существовать. '
+        'Строки пишутся пачками через bulk_create, каждая порция — '
+        'в своей транзакции.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл или - для stdin.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--chunk-size', type=int, default=20000)
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.progress = Progress(self.stderr)
+        self.pending = {News: [], Comment: []}
+        if options['path'] == '-':
+            self.load(sys.stdin)
+        else:
+            with open(options['path'], encoding='utf-8') as file:
+                self.load(file)
+        self.progress.report()
+        News.objects.recount_comments()
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено строк: {self.progress.count}'
+        ))
+
+    def load(self, file):
+        with explicit_timestamps(News), explicit_timestamps(Comment):
+            for number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    model, build = BUILDERS[record['model']]
+                    obj = build(record.get('pk'), record['fields'])
+                except (KeyError, ValueError) as error:
+                    raise CommandError(f'Строка {number}: {error!r}')
+                self.pending[model].append(obj)
+                if sum(map(len, self.pending.values())) >= (
+                    self.options['chunk_size']
+                ):
+                    self.flush()
+            self.flush()
+
+    def flush(self):
+        """Пишет накопленные строки; новости раньше их комментариев."""
+        with transaction.atomic():
+            for model, objs in self.pending.items():
+                model.objects.bulk_create(
+                    objs, batch_size=self.options['batch_size']
+                )
+                self.progress.add(len(objs))
+                objs.clear()
@@ -0,0 +1,77 @@
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from news.moderation import moderate_batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Проверяет комментарии на модерации правилами MODERATION_RULES '
+        'пачками. С --workers больше одного запускает столько процессов, '
+        'каждый со своей частью очереди. Без --once ждёт новые '
+        'комментарии, пока его не остановят.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int,
+                            default=settings.MODERATION_WORKERS)
+        parser.add_argument('--batch-size', type=int,
+                            default=settings.MODERATION_BATCH_SIZE)
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Пауза, если пачка ничего не изменила.')
+        parser.add_argument('--once', action='store_true',
+                            help='Разобрать очередь и завершиться.')
+        parser.add_argument('--shard', type=int,
+                            help='Часть очереди для одного процесса.')
+
+    def handle(self, *args, **options):
+        if options['shard'] is not None:
+            self.work(options['shard'], options)
+        elif options['workers'] > 1:
+            self.start_pool(options)
+        else:
+            options['workers'] = 1
+            self.work(0, options)
+
+    def work(self, shard, options):
+        changed = 0
+        while True:
+            count = moderate_batch(
+                options['batch_size'], shard, options['workers']
+            )
+            changed += count
+            if count:
+                continue
+            # Пачка ничего не изменила: очередь пуста или в ней только
+            # комментарии, исправленные после чтения. Их берёт следующий
+            # проход после паузы.
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(f'Часть {shard}: изменено {changed}')
+
+    def start_pool(self, options):
+        command = [
+            sys.executable, sys.argv[0], 'moderate_comments',
+            '--workers', str(options['workers']),
+            '--batch-size', str(options['batch_size']),
+            '--interval', str(options['interval']),
+        ]
+        if options['once']:
+            command.append('--once')
+        workers = [
+            subprocess.Popen([*command, '--shard', str(shard)])
+            for shard in range(options['workers'])
+        ]
+        try:
+            failed = [worker.args for worker in workers if worker.wait()]
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.terminate()
+            raise
+        if failed:
+            raise CommandError(f'Процессы завершились с ошибкой: {failed}')
@@ -0,0 +1,78 @@
+from django.db import migrations
+
+# Новости и комментарии лежат в одной таблице FTS5: rowid новости
+# равен id * 2, комментария — id * 2 + 1, поэтому триггеры находят
+# нужную строку по первичному ключу, а не перебором.
+CREATE_INDEX = (
+    """
+    CREATE VIRTUAL TABLE news_search USING fts5(
+        title,
+        body,
+        news_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER news_search_news_insert AFTER INSERT ON news_news
+    BEGIN
+        INSERT INTO news_search (rowid, title, body, news_id)
+        VALUES (new.id * 2, new.title, new.text, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER news_search_news_update
+    AFTER UPDATE OF title, text ON news_news
+    BEGIN
+        UPDATE news_search SET title = new.title, body = new.text
+        WHERE rowid = new.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER news_search_news_delete AFTER DELETE ON news_news
+    BEGIN
+        DELETE FROM news_search WHERE rowid = old.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER news_search_comment_insert AFTER INSERT ON news_comment
+    BEGIN
+        INSERT INTO news_search (rowid, title, body, news_id)
+        VALUES (new.id * 2 + 1, '', new.text, new.news_id);
+    END
+    """,
+    """
+    CREATE TRIGGER news_search_comment_update
+    AFTER UPDATE OF text, news_id ON news_comment
+    BEGIN
+        UPDATE news_search SET body = new.text, news_id = new.news_id
+        WHERE rowid = new.id * 2 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER news_search_comment_delete AFTER DELETE ON news_comment
+    BEGIN
+        DELETE FROM news_search WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+)
+
+DROP_INDEX = (
+    'DROP TRIGGER news_search_comment_delete',
+    'DROP TRIGGER news_search_comment_update',
+    'DROP TRIGGER news_search_comment_insert',
+    'DROP TRIGGER news_search_news_delete',
+    'DROP TRIGGER news_search_news_update',
+    'DROP TRIGGER news_search_news_insert',
+    'DROP TABLE news_search',
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_INDEX, DROP_INDEX),
+    ]
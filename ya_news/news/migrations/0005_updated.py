@@ -0,0 +1,60 @@
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+# Пересоздание таблиц при AddField на SQLite удалило бы триггеры
+# поискового индекса, поэтому столбцы добавляются через ALTER TABLE.
+ADD_COLUMN = (
+    'ALTER TABLE {} ADD COLUMN "updated" datetime NOT NULL '
+    "DEFAULT '1970-01-01 00:00:00'"
+)
+# Обратная операция; индекс по столбцу к этому моменту уже удалён.
+DROP_COLUMN = 'ALTER TABLE {} DROP COLUMN "updated"'
+
+
+def fill_updated(apps, schema_editor):
+    News = apps.get_model('news', 'News')
+    Comment = apps.get_model('news', 'Comment')
+    News.objects.update(updated=timezone.now())
+    Comment.objects.update(updated=F('created'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_search_index'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    ADD_COLUMN.format('news_news'),
+                    DROP_COLUMN.format('news_news'),
+                ),
+                migrations.RunSQL(
+                    ADD_COLUMN.format('news_comment'),
+                    DROP_COLUMN.format('news_comment'),
+                ),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name='news',
+                    name='updated',
+                    field=models.DateTimeField(auto_now=True),
+                ),
+                migrations.AddField(
+                    model_name='comment',
+                    name='updated',
+                    field=models.DateTimeField(auto_now=True),
+                ),
+            ],
+        ),
+        migrations.RunPython(fill_updated, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(
+                fields=['news', 'updated'], name='comment_news_updated_idx'
+            ),
+        ),
+    ]
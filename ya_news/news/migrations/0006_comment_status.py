@@ -0,0 +1,60 @@
+from django.db import migrations, models
+
+# Пересоздание таблицы при AddField на SQLite удалило бы триггеры
+# поискового индекса, поэтому столбец добавляется через ALTER TABLE.
+# Комментарии, написанные до модерации, считаются одобренными.
+ADD_COLUMN = (
+    'ALTER TABLE news_comment ADD COLUMN "status" smallint unsigned '
+    'NOT NULL DEFAULT 1 CHECK ("status" >= 0)'
+)
+# Обратная операция; индексы по столбцу к этому моменту уже удалены.
+DROP_COLUMN = 'ALTER TABLE news_comment DROP COLUMN "status"'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_updated'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(ADD_COLUMN, DROP_COLUMN),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name='comment',
+                    name='status',
+                    field=models.PositiveSmallIntegerField(
+                        choices=[
+                            (0, 'На модерации'),
+                            (1, 'Одобрен'),
+                            (2, 'Отклонён'),
+                        ],
+                        default=1,
+                        verbose_name='Статус',
+                    ),
+                ),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comment_news_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(
+                fields=['news', 'status', 'created', 'id'],
+                name='comment_news_status_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(
+                condition=models.Q(status=0),
+                fields=['id'],
+                name='comment_pending_idx',
+            ),
+        ),
+    ]
@@ -2,15 +2,51 @@ from datetime import datetime
 
 from django.conf import settings
 from django.db import models
+from django.db.models import (
+    Case, Count, F, OuterRef, Q, Subquery, Value, When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+class NewsQuerySet(models.QuerySet):
+
+    def recount_comments(self):
+        """
+        Пересчитывает счётчик одобренных комментариев.
+
+        У новостей, чей счётчик изменился, сдвигается и updated: по нему
+        лента отдаёт Last-Modified, а update() обходит auto_now.
+        """
+        comments = Comment.objects.filter(
+            news=OuterRef('pk'), status=Comment.Status.APPROVED
+        ).order_by().values('news').annotate(
+            total=Count('pk')
+        ).values('total')
+        total = Coalesce(Subquery(comments), 0)
+        return self.update(
+            comment_count=total,
+            updated=Case(
+                When(comment_count=total, then=F('updated')),
+                default=Value(timezone.now()),
+            ),
+        )
 
 
 class News(models.Model):
     title = models.CharField(max_length=50)
     text = models.TextField()
     date = models.DateField(default=datetime.today)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    updated = models.DateTimeField(auto_now=True)
+
+    objects = NewsQuerySet.as_manager()
 
     class Meta:
         ordering = ('-date',)
+        indexes = (
+            models.Index(fields=('-date',), name='news_date_desc_idx'),
+        )
         verbose_name_plural = 'Новости'
         verbose_name = 'Новость'
 
@@ -18,7 +54,26 @@ class News(models.Model):
         return self.title
 
 
+class CommentQuerySet(models.QuerySet):
+
+    def approved(self):
+        return self.filter(status=Comment.Status.APPROVED)
+
+
 class Comment(models.Model):
+    """
+    Комментарий к новости.
+
+    Комментарии с сайта сохраняются на модерации и показываются только
+    после проверки командой moderate_comments. Созданные иначе (админка,
+    импорт, генератор данных) считаются проверенными.
+    """
+
+    class Status(models.IntegerChoices):
+        PENDING = 0, 'На модерации'
+        APPROVED = 1, 'Одобрен'
+        REJECTED = 2, 'Отклонён'
+
     news = models.ForeignKey(
         News,
         on_delete=models.CASCADE
@@ -29,9 +84,30 @@ class Comment(models.Model):
     )
     text = models.TextField()
     created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+    status = models.PositiveSmallIntegerField(
+        'Статус', choices=Status.choices, default=Status.APPROVED
+    )
+
+    objects = CommentQuerySet.as_manager()
 
     class Meta:
         ordering = ('created',)
+        indexes = (
+            models.Index(
+                fields=('news', 'status', 'created', 'id'),
+                name='comment_news_status_idx'
+            ),
+            # Очередь модерации: в индексе только ждущие проверки строки.
+            models.Index(
+                fields=('id',), condition=Q(status=0),
+                name='comment_pending_idx'
+            ),
+            models.Index(
+                fields=('news', 'updated'), name='comment_news_updated_idx'
+            ),
+            models.Index(fields=('author', 'id'), name='comment_author_idx'),
+        )
 
     def __str__(self):
         return self.text[:50]
@@ -0,0 +1,225 @@
+import logging
+import os
+import re
+from collections import deque, namedtuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .cache import HOME, bump_versions
+from .models import Comment, News
+
+logger = logging.getLogger(__name__)
+
+BAD_WORDS = (
+    'редиска',
+    'негодяй',
+    # Дополните список на своё усмотрение.
+)
+
+WARNING = 'Не ругайтесь!'
+
+Match = namedtuple('Match', ('word', 'start', 'end'))
+
+LINK = re.compile(r'https?://', re.IGNORECASE)
+
+
+class WordMatcher:
+    """
+    Автомат Ахо — Корасик для поиска всех слов из списка за один проход.
+
+    Сравнение регистронезависимое: и слова, и текст приводятся
+    к нижнему регистру, позиции совпадений считаются в тексте
+    после lower() (для кириллицы и латиницы они совпадают с исходными).
+    """
+
+    def __init__(self, words):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        for word in words:
+            self._add(word.lower())
+        self._link()
+
+    def _add(self, word):
+        if not word:
+            return
+        state = 0
+        for char in word:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        if word not in self._output[state]:
+            self._output[state] += (word,)
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] += self._output[
+                    self._fail[next_state]
+                ]
+
+    def finditer(self, text):
+        """Перечисляет все вхождения слов в текст."""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for position, char in enumerate(text.lower()):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for word in output[state]:
+                yield Match(word, position + 1 - len(word), position + 1)
+
+    def search(self, text):
+        """Возвращает первое вхождение или None."""
+        return next(self.finditer(text), None)
+
+
+_matcher = None
+_matcher_key = None
+
+
+def _words_file_key():
+    path = getattr(settings, 'BAD_WORDS_FILE', None)
+    if not path:
+        return None
+    return path, os.stat(path).st_mtime_ns
+
+
+def load_words(path):
+    with open(path, encoding='utf-8') as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+def get_bad_words_matcher():
+    """
+    Возвращает автомат для BAD_WORDS и словаря из настройки BAD_WORDS_FILE.
+
+    Автомат собирается один раз и пересобирается только при изменении
+    файла словаря, поэтому новый список подхватывается без перезапуска.
+    Если файл пропал или не читается, остаётся прежний автомат.
+    """
+    global _matcher, _matcher_key
+    try:
+        key = _words_file_key()
+        if _matcher is None or key != _matcher_key:
+            words = list(BAD_WORDS)
+            if key is not None:
+                words.extend(load_words(key[0]))
+            _matcher, _matcher_key = WordMatcher(words), key
+    except OSError as error:
+        # Без словаря проверка продолжается с последним прочитанным
+        # списком, а до первого чтения — со встроенным BAD_WORDS.
+        logger.warning('Словарь BAD_WORDS_FILE не прочитан: %s', error)
+        if _matcher is None:
+            _matcher = WordMatcher(BAD_WORDS)
+    return _matcher
+
+
+def find_bad_words(text):
+    """Все запрещённые слова в тексте с их позициями."""
+    return list(get_bad_words_matcher().finditer(text))
+
+
+# Правило получает пачку комментариев и возвращает для каждого причину
+# отказа или None. Правила перечислены в настройке MODERATION_RULES.
+
+
+def bad_words_rule(comments):
+    matcher = get_bad_words_matcher()
+    return [
+        WARNING if matcher.search(comment.text) is not None else None
+        for comment in comments
+    ]
+
+
+def links_rule(comments):
+    return [
+        'Слишком много ссылок'
+        if len(LINK.findall(comment.text)) > settings.MODERATION_MAX_LINKS
+        else None
+        for comment in comments
+    ]
+
+
+def score(comments):
+    """Причина отказа для каждого комментария или None, если он одобрен."""
+    reasons = [None] * len(comments)
+    for path in settings.MODERATION_RULES:
+        rule = import_string(path)
+        reasons = [
+            reason or rule_reason
+            for reason, rule_reason in zip(reasons, rule(comments))
+        ]
+    return reasons
+
+
+def set_status(comments, status):
+    """
+    Меняет статус комментариев из queryset.
+
+    Счётчики их новостей пересчитываются, а закешированные страницы
+    сбрасываются. Возвращает число изменённых комментариев.
+    """
+    # Чтение до транзакции: она начинается сразу с записи, и на SQLite
+    # без BEGIN IMMEDIATE параллельные процессы ждут блокировку, а не
+    # падают, когда пытаются повысить её с чтения до записи.
+    news_ids = set(comments.values_list('news_id', flat=True))
+    with transaction.atomic():
+        changed = comments.update(status=status, updated=timezone.now())
+        News.objects.filter(pk__in=news_ids).recount_comments()
+    if news_ids:
+        bump_versions(*news_ids, HOME)
+    return changed
+
+
+def moderate_batch(limit=None, shard=0, shards=1):
+    """
+    Проверяет пачку комментариев на модерации всеми правилами.
+
+    Процессы с разными shard из shards берут непересекающиеся части
+    очереди. Комментарий, исправленный автором во время проверки,
+    остаётся в очереди до следующей пачки. Возвращает число
+    комментариев, статус которых изменился.
+    """
+    read_at = timezone.now()
+    pending = Comment.objects.filter(
+        status=Comment.Status.PENDING
+    ).order_by('pk')
+    if shards > 1:
+        pending = pending.alias(shard=F('pk') % shards).filter(shard=shard)
+    comments = list(pending.only('news_id', 'text')[
+        :limit or settings.MODERATION_BATCH_SIZE
+    ])
+    verdicts = {Comment.Status.APPROVED: [], Comment.Status.REJECTED: []}
+    for comment, reason in zip(comments, score(comments)):
+        verdicts[
+            Comment.Status.REJECTED if reason else Comment.Status.APPROVED
+        ].append(comment.pk)
+    changed = 0
+    for status, pks in verdicts.items():
+        if pks:
+            changed += set_status(
+                Comment.objects.filter(
+                    pk__in=pks,
+                    status=Comment.Status.PENDING,
+                    updated__lte=read_at,
+                ),
+                status,
+            )
+    return changed
@@ -0,0 +1,94 @@
+import base64
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+from .models import Comment
+
+
+def encode_cursor(comment):
+    """Курсор указывает на последний показанный комментарий."""
+    raw = f'{comment.created.isoformat()}|{comment.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        created, pk = base64.urlsafe_b64decode(
+            cursor.encode()
+        ).decode().split('|')
+        return datetime.fromisoformat(created), int(pk)
+    except ValueError:
+        raise Http404('Некорректный курсор.')
+
+
+def page_slice(comments, cursor, limit):
+    comments = comments.select_related('author').order_by('created', 'pk')
+    if cursor:
+        created, pk = decode_cursor(cursor)
+        comments = comments.filter(
+            Q(created__gt=created) | Q(created=created, pk__gt=pk)
+        )
+    return list(comments[:limit + 1])
+
+
+def get_comments_page(news_id, cursor=None, limit=None, author=None):
+    """
+    Возвращает страницу одобренных комментариев и курсор следующей.
+
+    Страница выбирается по ключу (created, id), а не по смещению,
+    поэтому её стоимость не зависит от того, насколько она далеко.
+    Автору к ним подмешиваются его же комментарии на модерации —
+    отдельным запросом по тому же индексу (news, status, created, id).
+    """
+    limit = limit or settings.COMMENTS_PER_PAGE
+    comments = page_slice(
+        Comment.objects.approved().filter(news_id=news_id), cursor, limit
+    )
+    if author is not None:
+        own = page_slice(
+            Comment.objects.filter(
+                news_id=news_id, status=Comment.Status.PENDING, author=author
+            ),
+            cursor, limit,
+        )
+        comments = sorted(
+            comments + own, key=lambda comment: (comment.created, comment.pk)
+        )[:limit + 1]
+    next_cursor = None
+    if len(comments) > limit:
+        comments = comments[:limit]
+        next_cursor = encode_cursor(comments[-1])
+    return comments, next_cursor
+
+
+class CommentsPage:
+    """
+    Ленивая страница комментариев.
+
+    Запрос выполняется при первом обращении к comments или next_cursor,
+    поэтому закешированный фрагмент шаблона обходится без него.
+    """
+
+    def __init__(self, news_id, cursor=None, limit=None, author=None):
+        self.news_id = news_id
+        self.cursor = cursor
+        self.limit = limit
+        self.author = author
+
+    @cached_property
+    def _page(self):
+        return get_comments_page(
+            self.news_id, self.cursor, self.limit, self.author
+        )
+
+    @property
+    def comments(self):
+        return self._page[0]
+
+    @property
+    def next_cursor(self):
+        return self._page[1]
@@ -1,13 +1,105 @@
 import datetime
+from types import SimpleNamespace
 
 import pytest
 
 from django.contrib.auth import get_user_model
+from django.db import connection, transaction
 from django.test import Client
 
 from news.models import Comment, News
 
 
+@pytest.fixture(autouse=True)
+def raise_on_n_plus_one(settings):
+    settings.NPLUSONE_RAISE = True
+
+
+# Shared dataset: built once per session and copied into an attached
+# in-memory database; every test that asks for it gets it back with
+# INSERT ... SELECT inside its own transaction, which is rolled back.
+GRAPH_AUTHORS = 10
+GRAPH_NEWS = 60
+GRAPH_COMMENTS_PER_NEWS = 20
+
+
+def graph_tables():
+    """Dataset tables in foreign key order."""
+    return [
+        model._meta.db_table
+        for model in (get_user_model(), News, Comment)
+    ]
+
+
+def build_news_graph():
+    User = get_user_model()
+    # bulk_create on SQLite does not return ids, and relations need them.
+    authors = [
+        User.objects.create(username=f'graph-author-{number}')
+        for number in range(GRAPH_AUTHORS)
+    ]
+    today = datetime.date.today()
+    news = [
+        News.objects.create(
+            title=f'Graph news {number}',
+            text=f'Graph news text {number}',
+            date=today - datetime.timedelta(days=number),
+        )
+        for number in range(GRAPH_NEWS)
+    ]
+    Comment.objects.bulk_create(
+        Comment(
+            news=item,
+            author=authors[number % GRAPH_AUTHORS],
+            text=f'Graph comment {number}',
+        )
+        for item in news
+        for number in range(GRAPH_COMMENTS_PER_NEWS)
+    )
+    News.objects.recount_comments()
+    return SimpleNamespace(
+        author_id=authors[0].pk,
+        news_ids=[item.pk for item in news],
+        comments_per_news=GRAPH_COMMENTS_PER_NEWS,
+    )
+
+
+@pytest.fixture(scope='session')
+def news_graph_snapshot(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock(), connection.cursor() as cursor:
+        cursor.execute("ATTACH DATABASE ':memory:' AS news_graph")
+        with transaction.atomic():
+            graph = build_news_graph()
+            for table in graph_tables():
+                cursor.execute(
+                    f'CREATE TABLE news_graph.{table} AS '
+                    f'SELECT * FROM main.{table}'
+                )
+            for table in reversed(graph_tables()):
+                cursor.execute(
+                    f'DELETE FROM main.{table} '
+                    f'WHERE id IN (SELECT id FROM news_graph.{table})'
+                )
+    return graph
+
+
+@pytest.fixture
+def news_graph(db, news_graph_snapshot):
+    """60 news with 20 comments each by 10 authors."""
+    with connection.cursor() as cursor:
+        for table in graph_tables():
+            cursor.execute(
+                f'INSERT INTO main.{table} SELECT * FROM news_graph.{table}'
+            )
+    return SimpleNamespace(
+        author=get_user_model().objects.get(
+            pk=news_graph_snapshot.author_id
+        ),
+        news_ids=news_graph_snapshot.news_ids,
+        comments_per_news=news_graph_snapshot.comments_per_news,
+    )
+
+
 @pytest.fixture
 def author():
     User = get_user_model()
@@ -54,6 +146,11 @@ def comment(author, news):
     )
 
 
+@pytest.fixture
+def news_id(news):
+    return news.id,
+
+
 @pytest.fixture
 def comment_id(comment):
     return comment.id,
@@ -0,0 +1,148 @@
+from http import HTTPStatus
+
+import pytest
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from news.models import Comment, News
+
+NEWS_CHANGELIST = reverse('admin:news_news_changelist')
+COMMENT_CHANGELIST = reverse('admin:news_comment_changelist')
+
+
+def add_comments(news, count):
+    User = get_user_model()
+    for number in range(count):
+        Comment.objects.create(
+            news=news,
+            author=User.objects.create(username=f'{news.pk}-{number}'),
+            text=f'Комментарий {number}',
+        )
+    News.objects.recount_comments()
+
+
+def count_queries(client, url, data=None):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, data)
+    assert response.status_code == HTTPStatus.OK
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db
+def test_news_change_page_queries_do_not_depend_on_comments(admin_client):
+    small, large = News.objects.create(title='Мало'), News.objects.create(
+        title='Много'
+    )
+    add_comments(small, 2)
+    add_comments(large, 40)
+    # The first admin request warms up caches such as content types.
+    admin_client.get(reverse('admin:news_news_change', args=(small.pk,)))
+
+    assert count_queries(
+        admin_client, reverse('admin:news_news_change', args=(small.pk,))
+    ) == count_queries(
+        admin_client, reverse('admin:news_news_change', args=(large.pk,))
+    )
+
+
+@pytest.mark.django_db
+def test_news_change_page_shows_latest_comments(admin_client, news, settings):
+    settings.ADMIN_INLINE_COMMENTS = 3
+    add_comments(news, 5)
+
+    response = admin_client.get(
+        reverse('admin:news_news_change', args=(news.pk,))
+    )
+
+    formset = response.context['inline_admin_formsets'][0].formset
+    assert [form.instance for form in formset.forms] == list(
+        Comment.objects.order_by('-id')[:3]
+    )
+    assert f'?news__id__exact={news.pk}' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_comment_change_page_does_not_list_users(admin_client, comment):
+    add_comments(comment.news, 5)
+
+    response = admin_client.get(
+        reverse('admin:news_comment_change', args=(comment.pk,))
+    )
+
+    content = response.content.decode()
+    assert content.count('vForeignKeyRawIdAdminField') == 2
+    assert '<select name="author"' not in content
+    assert '<select name="news"' not in content
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url', [NEWS_CHANGELIST, COMMENT_CHANGELIST])
+def test_changelist_queries_do_not_depend_on_rows(admin_client, url):
+    news = News.objects.create(title='Первая')
+    add_comments(news, 2)
+    few = count_queries(admin_client, url)
+
+    for number in range(10):
+        add_comments(News.objects.create(title=f'Новость {number}'), 3)
+
+    assert count_queries(admin_client, url) == few
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'url, expected',
+    [(NEWS_CHANGELIST, 'news'), (COMMENT_CHANGELIST, 'comment')],
+)
+def test_changelist_search_uses_index(admin_client, author, url, expected):
+    news = News.objects.create(title='Программисты', text='Текст')
+    found = {
+        'news': news,
+        'comment': Comment.objects.create(
+            news=news, author=author, text='Программирование'
+        ),
+    }[expected]
+    News.objects.create(title='Погода', text='Дождь')
+
+    response = admin_client.get(url, {'q': 'програм'})
+
+    assert list(response.context['cl'].result_list) == [found]
+
+
+@pytest.mark.django_db
+def test_comment_changelist_filters_by_news(admin_client, news):
+    other = News.objects.create(title='Другая')
+    add_comments(news, 2)
+    add_comments(other, 3)
+
+    response = admin_client.get(
+        COMMENT_CHANGELIST, {'news__id__exact': news.pk}
+    )
+
+    assert {
+        comment.news_id for comment in response.context['cl'].result_list
+    } == {news.pk}
+
+
+@pytest.mark.django_db
+def test_changelist_count_is_capped(admin_client, news, settings):
+    settings.ADMIN_COUNT_LIMIT = 3
+    add_comments(news, 5)
+
+    response = admin_client.get(COMMENT_CHANGELIST)
+
+    assert response.context['cl'].result_count == 3
+
+
+@pytest.mark.django_db
+def test_comment_delete_in_admin_updates_counter(admin_client, comment):
+    News.objects.recount_comments()
+
+    admin_client.post(
+        reverse('admin:news_comment_delete', args=(comment.pk,)),
+        {'post': 'yes'},
+    )
+
+    assert News.objects.get(pk=comment.news_id).comment_count == 0
@@ -0,0 +1,109 @@
+import pytest
+
+from django.urls import reverse
+
+from news.cache import get_cache
+from news.models import Comment, News
+from news.moderation import moderate_batch
+
+
+@pytest.fixture(autouse=True)
+def news_cache(settings):
+    settings.CACHES = {
+        **settings.CACHES,
+        'news': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'news-tests',
+        },
+    }
+    yield
+    get_cache().clear()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name, args', (
+    ('news:home', ()),
+    ('news:detail', pytest.lazy_fixture('news_id')),
+))
+def test_anonymous_page_is_served_from_cache(
+    client, django_assert_num_queries, name, args
+):
+    url = reverse(name, args=args)
+    content = client.get(url).content
+
+    with django_assert_num_queries(0):
+        response = client.get(url)
+    assert response.content == content
+
+
+@pytest.mark.django_db
+def test_new_comment_invalidates_pages(client, author_client, news):
+    detail_url = reverse('news:detail', args=(news.id,))
+    home_url = reverse('news:home')
+    client.get(detail_url)
+    client.get(home_url)
+
+    author_client.post(detail_url, data={'text': 'Fresh comment'})
+    moderate_batch()
+
+    assert 'Fresh comment' in client.get(detail_url).content.decode()
+    assert 'Комментариев: 1' in client.get(home_url).content.decode()
+
+
+@pytest.mark.django_db
+def test_edit_and_delete_invalidate_detail(client, author_client, comment):
+    detail_url = reverse('news:detail', args=(comment.news_id,))
+    client.get(detail_url)
+
+    author_client.post(
+        reverse('news:edit', args=(comment.id,)), data={'text': 'Edited'}
+    )
+    moderate_batch()
+    assert 'Edited' in client.get(detail_url).content.decode()
+
+    author_client.post(reverse('news:delete', args=(comment.id,)))
+    assert 'Edited' not in client.get(detail_url).content.decode()
+
+
+@pytest.mark.django_db
+def test_comment_fragment_is_cached_per_version(author, author_client, news):
+    detail_url = reverse('news:detail', args=(news.id,))
+    author_client.get(detail_url)
+    Comment.objects.create(news=news, author=author, text='Hidden comment')
+
+    # Writes that bypass the views keep the version, so the fragment
+    # is still served from the cache.
+    assert 'Hidden comment' not in author_client.get(
+        detail_url
+    ).content.decode()
+
+    author_client.post(detail_url, data={'text': 'Visible comment'})
+    moderate_batch()
+    content = author_client.get(detail_url).content.decode()
+    assert 'Hidden comment' in content
+    assert 'Visible comment' in content
+
+
+@pytest.mark.django_db
+def test_comment_admin_invalidates_pages(client, admin_client, comment):
+    News.objects.recount_comments()
+    detail = reverse('news:detail', args=(comment.news_id,))
+    home = reverse('news:home')
+    client.get(detail)
+    assert 'Комментариев: 1' in client.get(home).content.decode()
+
+    admin_client.post(
+        reverse('admin:news_comment_change', args=(comment.pk,)),
+        {
+            'news': comment.news_id, 'author': comment.author_id,
+            'text': 'Исправлено в админке', 'status': comment.status,
+        },
+    )
+    assert 'Исправлено в админке' in client.get(detail).content.decode()
+
+    admin_client.post(
+        reverse('admin:news_comment_delete', args=(comment.pk,)),
+        {'post': 'yes'},
+    )
+    assert 'Исправлено в админке' not in client.get(detail).content.decode()
+    assert 'Комментариев: 1' not in client.get(home).content.decode()
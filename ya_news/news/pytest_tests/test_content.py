@@ -6,7 +6,7 @@ import pytest
 from django.conf import settings
 from django.urls import reverse
 
-from news.models import Comment
+from news.models import Comment, News
 
 
 @pytest.mark.django_db
@@ -23,6 +23,24 @@ def test_home_page_max_news_count(client, create_news, num_news):
     ) <= settings.NEWS_COUNT_ON_HOME_PAGE
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize('num_comments', [1, 30])
+def test_home_page_queries_do_not_depend_on_comments(
+    client, author, create_news, django_assert_num_queries, num_comments
+):
+    for i in range(3):
+        news = create_news(f'Title {i}', f'Text {i}', datetime.datetime.now())
+        Comment.objects.bulk_create(
+            Comment(news=news, author=author, text=f'Comment {j}')
+            for j in range(num_comments)
+        )
+    News.objects.recount_comments()
+
+    with django_assert_num_queries(1):
+        response = client.get(reverse('news:home'))
+    assert 'Комментариев: {}'.format(num_comments) in response.content.decode()
+
+
 @pytest.mark.django_db
 def test_home_page_news_order(client, create_news):
 
@@ -108,3 +126,88 @@ def test_authorized_client_has_form(author_client, create_news, author):
         'news:detail', kwargs={'pk': news.pk}))
     assert response.status_code == HTTPStatus.OK
     assert 'form' in response.context
+
+
+@pytest.mark.django_db
+def test_news_detail_comments_are_paginated(client, author, news, settings):
+    settings.COMMENTS_PER_PAGE = 2
+    comments = [
+        Comment.objects.create(news=news, author=author, text=f'Comment {i}')
+        for i in range(5)
+    ]
+
+    response = client.get(reverse('news:detail', kwargs={'pk': news.pk}))
+    assert response.context['comments_page'].comments == comments[:2]
+    pages = [response.context['comments_page'].comments]
+    cursor = response.context['comments_page'].next_cursor
+    while cursor:
+        response = client.get(
+            reverse('news:comments', kwargs={'pk': news.pk}),
+            {'after': cursor}
+        )
+        assert response.status_code == HTTPStatus.OK
+        pages.append(response.context['comments_page'].comments)
+        cursor = response.context['comments_page'].next_cursor
+
+    assert pages == [comments[:2], comments[2:4], comments[4:]]
+
+
+@pytest.mark.django_db
+def test_news_comments_invalid_cursor(client, news):
+    response = client.get(
+        reverse('news:comments', kwargs={'pk': news.pk}),
+        {'after': 'not-a-cursor'}
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_home_page_shows_newest_news_of_graph(client, news_graph):
+    response = client.get(reverse('news:home'))
+    news_list = response.context['news_list']
+    assert [item.pk for item in news_list] == news_graph.news_ids[
+        :settings.NEWS_COUNT_ON_HOME_PAGE
+    ]
+    assert all(
+        item.comment_count == news_graph.comments_per_news
+        for item in news_list
+    )
+
+
+@pytest.mark.django_db
+def test_graph_comments_are_paginated(client, news_graph, settings):
+    settings.COMMENTS_PER_PAGE = 7
+    news_pk = news_graph.news_ids[-1]
+    expected = list(
+        Comment.objects.filter(news_id=news_pk).order_by('created', 'pk')
+    )
+
+    response = client.get(reverse('news:detail', kwargs={'pk': news_pk}))
+    pages = [response.context['comments_page'].comments]
+    cursor = response.context['comments_page'].next_cursor
+    while cursor:
+        response = client.get(
+            reverse('news:comments', kwargs={'pk': news_pk}),
+            {'after': cursor}
+        )
+        pages.append(response.context['comments_page'].comments)
+        cursor = response.context['comments_page'].next_cursor
+
+    assert len(pages) == 3
+    assert sum(pages, []) == expected
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('run', [1, 2])
+def test_graph_is_restored_for_every_test(news_graph, run):
+    # Each run deletes part of the graph; the next one gets it back whole.
+    assert News.objects.count() == len(news_graph.news_ids)
+    assert Comment.objects.count() == (
+        len(news_graph.news_ids) * news_graph.comments_per_news
+    )
+    News.objects.filter(pk__in=news_graph.news_ids[:run * 10]).delete()
+
+
+@pytest.mark.django_db
+def test_graph_is_not_seen_without_fixture():
+    assert not News.objects.exists()
@@ -0,0 +1,122 @@
+import datetime
+from http import HTTPStatus
+
+import pytest
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone
+
+from news.models import Comment, News
+from news.moderation import moderate_batch
+
+HOME_FEED = reverse('news:api_news')
+
+
+def comments_feed(news_id):
+    return reverse('news:api_comments', args=(news_id,))
+
+
+@pytest.fixture
+def many_news():
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text='Текст')
+        for index in range(settings.NEWS_COUNT_ON_HOME_PAGE + 1)
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('many_news')
+def test_home_feed(client):
+    response = client.get(HOME_FEED)
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.json()['results']) == (
+        settings.NEWS_COUNT_ON_HOME_PAGE
+    )
+    assert response.has_header('ETag')
+    assert response.has_header('Last-Modified')
+
+
+@pytest.mark.django_db
+def test_home_feed_not_modified_without_loading_news(
+    client, news, django_assert_num_queries
+):
+    etag = client.get(HOME_FEED)['ETag']
+    with django_assert_num_queries(2):
+        response = client.get(HOME_FEED, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response['ETag'] == etag
+    assert not response.content
+
+
+@pytest.mark.django_db
+def test_home_feed_etag_follows_comments(author_client, client, news):
+    etag = client.get(HOME_FEED)['ETag']
+    author_client.post(
+        reverse('news:detail', args=(news.id,)), {'text': 'Комментарий'}
+    )
+    moderate_batch()
+    response = client.get(HOME_FEED, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['results'][0]['comment_count'] == 1
+
+
+@pytest.mark.django_db
+def test_comments_feed(client, news, comment, django_assert_num_queries):
+    response = client.get(comments_feed(news.id))
+    assert [item['text'] for item in response.json()['results']] == [
+        comment.text
+    ]
+    with django_assert_num_queries(1):
+        response = client.get(
+            comments_feed(news.id), HTTP_IF_NONE_MATCH=response['ETag']
+        )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_comments_feed_if_modified_since(client, news, comment):
+    last_modified = client.get(comments_feed(news.id))['Last-Modified']
+    response = client.get(
+        comments_feed(news.id), HTTP_IF_MODIFIED_SINCE=last_modified
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_comments_feed_etag_follows_edit_and_delete(client, news, comment):
+    url = comments_feed(news.id)
+    etag = client.get(url)['ETag']
+    comment.text = 'Исправленный комментарий'
+    comment.save()
+    edited = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert edited.status_code == HTTPStatus.OK
+    Comment.objects.filter(pk=comment.pk).delete()
+    News.objects.recount_comments()
+    deleted = client.get(url, HTTP_IF_NONE_MATCH=edited['ETag'])
+    assert deleted.status_code == HTTPStatus.OK
+    assert deleted.json()['results'] == []
+
+
+@pytest.mark.django_db
+def test_comments_feed_last_modified_moves_forward_on_delete(
+    author_client, client, news, comment
+):
+    url = comments_feed(news.id)
+    News.objects.recount_comments()
+    # Backdate the comment and the news to get past the 1 s resolution.
+    past = timezone.now() - datetime.timedelta(hours=1)
+    Comment.objects.filter(pk=comment.pk).update(updated=past)
+    News.objects.filter(pk=news.pk).update(updated=past)
+    last_modified = client.get(url)['Last-Modified']
+
+    author_client.post(reverse('news:delete', args=(comment.id,)))
+
+    response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['results'] == []
+
+
+@pytest.mark.django_db
+def test_comments_feed_missing_news(client):
+    assert client.get(comments_feed(1)).status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,50 @@
+import pytest
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from yanews.instrumentation import recorder
+
+
+@pytest.fixture
+def perf_dir(settings, tmp_path):
+    settings.PERF_STATS_DIR = tmp_path
+    recorder.reset()
+    yield tmp_path
+    recorder.reset()
+
+
+def home_stats():
+    return recorder.snapshot()['windows'][-1]['views']['news:home']
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('perf_dir')
+def test_server_timing_header(client, news):
+    response = client.get(reverse('news:home'))
+    timing = response['Server-Timing']
+    assert 'desc="1 queries"' in timing
+    assert 'render;dur=' in timing
+    assert 'total;dur=' in timing
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('perf_dir')
+def test_stats_per_url_name(client, news):
+    for _ in range(3):
+        response = client.get(reverse('news:home'))
+    stats = home_stats()
+    assert stats['count'] == 3
+    assert stats['queries'] == 3
+    assert stats['bytes'] == 3 * len(response.content)
+    assert stats['render_ms'] > 0
+    assert sum(stats['buckets']) == 3
+
+
+@pytest.mark.django_db
+def test_perf_stats_command(client, news, perf_dir, capsys):
+    client.get(reverse('news:home'))
+    recorder.flush()
+    assert list(perf_dir.glob('*.json'))
+    call_command('perf_stats')
+    assert 'news:home' in capsys.readouterr().out
@@ -1,13 +1,21 @@
+import datetime
+import os
 from http import HTTPStatus
+from io import StringIO
 
 import pytest
 
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import Client
 from django.urls import reverse
+from django.utils import timezone
 
 from news.forms import BAD_WORDS, WARNING
-from news.models import Comment
+from news.models import Comment, News
+from news.moderation import (
+    Match, WordMatcher, bad_words_rule, find_bad_words, moderate_batch
+)
 
 
 @pytest.mark.django_db
@@ -42,12 +50,24 @@ def test_user_cant_use_bad_words(author_client, news):
     bad_words_data = {'text': f'Какой-то текст, {BAD_WORDS[0]}, еще текст'}
 
     response = author_client.post(url, data=bad_words_data)
-    comments_count = Comment.objects.count()
 
-    assert response.status_code == HTTPStatus.OK
-    assert 'form' in response.context
-    assert response.context['form'].errors['text'][0] == WARNING
-    assert comments_count == 0
+    # The comment is queued, then rejected by the moderation worker.
+    assert response.status_code == HTTPStatus.FOUND
+    comment = Comment.objects.get()
+    assert comment.status == Comment.Status.PENDING
+    moderate_batch()
+    comment.refresh_from_db()
+    assert comment.status == Comment.Status.REJECTED
+    assert bad_words_data['text'] not in author_client.get(
+        url
+    ).content.decode()
+
+
+def test_bad_words_rule_reason():
+    comments = [
+        Comment(text=f'Ты {BAD_WORDS[0]}!'), Comment(text='Спасибо'),
+    ]
+    assert bad_words_rule(comments) == [WARNING, None]
 
 
 @pytest.mark.django_db
@@ -106,3 +126,95 @@ def test_auth_user_cannot_edit_or_delete_other_users_comments(
     response = author_client.post(delete_url)
     comment2_exists = Comment.objects.filter(pk=comment2.id).exists()
     assert comment2_exists
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_create_and_delete(author_client, news):
+    url = reverse('news:detail', args=(news.id,))
+    author_client.post(url, data={'text': 'First'})
+    author_client.post(url, data={'text': 'Second'})
+    news.refresh_from_db()
+    assert news.comment_count == 0
+
+    moderate_batch()
+    news.refresh_from_db()
+    assert news.comment_count == 2
+
+    comment = Comment.objects.first()
+    author_client.post(reverse('news:delete', args=(comment.id,)))
+    news.refresh_from_db()
+    assert news.comment_count == 1
+
+
+@pytest.mark.django_db
+def test_recount_comments_command(author, news, comment):
+    Comment.objects.create(news=news, author=author, text='Second')
+    News.objects.update(comment_count=0)
+
+    call_command('recount_comments', stdout=StringIO())
+
+    news.refresh_from_db()
+    assert news.comment_count == 2
+
+
+def test_word_matcher_reports_every_match():
+    matcher = WordMatcher(('he', 'she', 'his', 'hers'))
+
+    assert list(matcher.finditer('uSHErs')) == [
+        Match('she', 1, 4), Match('he', 2, 4), Match('hers', 2, 6),
+    ]
+    assert matcher.search('nothing here') == Match('he', 8, 10)
+    assert matcher.search('nothing') is None
+
+
+def test_bad_words_file_is_reloaded(settings, tmp_path):
+    words_file = tmp_path / 'bad_words.txt'
+    words_file.write_text('мерзавец\n', encoding='utf-8')
+    settings.BAD_WORDS_FILE = str(words_file)
+    text = 'Ты мерзавец и подлец'
+
+    assert [match.word for match in find_bad_words(text)] == ['мерзавец']
+
+    words_file.write_text('мерзавец\nподлец\n', encoding='utf-8')
+    os.utime(words_file, ns=(0, os.stat(words_file).st_mtime_ns + 1))
+
+    assert find_bad_words(text) == [
+        Match('мерзавец', 3, 11), Match('подлец', 14, 20),
+    ]
+
+
+def test_missing_bad_words_file_keeps_last_words(settings, tmp_path, caplog):
+    words_file = tmp_path / 'bad_words.txt'
+    words_file.write_text('мерзавец\n', encoding='utf-8')
+    settings.BAD_WORDS_FILE = str(words_file)
+    assert find_bad_words('мерзавец')
+
+    words_file.unlink()
+
+    assert [match.word for match in find_bad_words('мерзавец')] == [
+        'мерзавец'
+    ]
+    assert 'BAD_WORDS_FILE' in caplog.text
+
+
+@pytest.mark.django_db
+def test_export_and_import_news_round_trip(author, news, tmp_path):
+    created = timezone.now() - datetime.timedelta(days=3)
+    Comment.objects.create(news=news, author=author, text='Old comment')
+    Comment.objects.filter(news=news).update(created=created)
+    dump = tmp_path / 'news.jsonl'
+    call_command('export_news', str(dump), stderr=StringIO())
+    expected_news = list(News.objects.values_list('pk', 'title', 'date'))
+    News.objects.all().delete()
+
+    call_command(
+        'import_news', str(dump), chunk_size=1,
+        stdout=StringIO(), stderr=StringIO()
+    )
+
+    assert list(
+        News.objects.values_list('pk', 'title', 'date')
+    ) == expected_news
+    comment = Comment.objects.get()
+    assert comment.created == created
+    assert comment.news.comment_count == 1
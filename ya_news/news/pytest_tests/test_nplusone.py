@@ -0,0 +1,86 @@
+import logging
+
+import pytest
+
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory
+from django.urls import reverse
+
+from news.models import Comment
+from yanews.nplusone import NPlusOneError, NPlusOneMiddleware
+
+COMMENTS_TEMPLATE = Template(
+    '{% for comment in comments %}\n'
+    '{{ comment.author.username }}\n'
+    '{% endfor %}'
+)
+
+
+def render_comments(request):
+    return HttpResponse(COMMENTS_TEMPLATE.render(Context({
+        'comments': Comment.objects.order_by('pk'),
+    })))
+
+
+@pytest.fixture
+def comments(author, news):
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Комментарий {index}')
+        for index in range(3)
+    )
+
+
+@pytest.fixture
+def request_comments():
+    return lambda: NPlusOneMiddleware(render_comments)(
+        RequestFactory().get('/comments/')
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('comments')
+def test_template_n_plus_one_names_template_line(request_comments):
+    with pytest.raises(NPlusOneError) as error:
+        request_comments()
+    report = str(error.value)
+    assert '3 раз из <unknown source>:2' in report
+    assert 'auth_user' in report
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('comments')
+def test_code_n_plus_one_names_code_line():
+    def count_authors(request):
+        usernames = [
+            comment.author.username for comment in Comment.objects.all()
+        ]
+        return HttpResponse(len(usernames))
+
+    with pytest.raises(NPlusOneError, match='test_nplusone.py:'):
+        NPlusOneMiddleware(count_authors)(RequestFactory().get('/'))
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('comments')
+def test_allowlist(settings, request_comments):
+    settings.NPLUSONE_ALLOW = [r'FROM "auth_user"']
+    assert request_comments().status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('comments')
+def test_logs_in_debug(settings, caplog, request_comments):
+    settings.NPLUSONE_RAISE = False
+    settings.DEBUG = True
+    with caplog.at_level(logging.WARNING, logger='yanews.nplusone'):
+        request_comments()
+    assert 'N+1' in caplog.text
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('comments')
+def test_detail_page_has_no_n_plus_one(author_client, news):
+    assert author_client.get(
+        reverse('news:detail', args=(news.id,))
+    ).status_code == 200
@@ -0,0 +1,41 @@
+import pytest
+
+from django.urls import reverse
+
+# Every request of a logged-in user starts with two queries:
+# the session and the user.
+AUTH_QUERIES = 2
+# A transaction inside a test is wrapped in SAVEPOINT/RELEASE.
+ATOMIC_QUERIES = 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'method, name, args, data, expected_queries',
+    (
+        # news, insert: moderation rules do not run on posting
+        ('post', 'news:detail', pytest.lazy_fixture('news_id'),
+         {'text': 'New comment'}, AUTH_QUERIES + 2),
+        ('post', 'news:detail', pytest.lazy_fixture('news_id'),
+         {'text': 'Ах ты, редиска!'}, AUTH_QUERIES + 2),
+        # comment with its news
+        ('get', 'news:edit', pytest.lazy_fixture('comment_id'),
+         None, AUTH_QUERIES + 1),
+        # comment, conditional status update, update, counter
+        ('post', 'news:edit', pytest.lazy_fixture('comment_id'),
+         {'text': 'Edited'}, AUTH_QUERIES + ATOMIC_QUERIES + 4),
+        # comment with its news
+        ('get', 'news:delete', pytest.lazy_fixture('comment_id'),
+         None, AUTH_QUERIES + 1),
+        # comment, delete, counter
+        ('post', 'news:delete', pytest.lazy_fixture('comment_id'),
+         None, AUTH_QUERIES + ATOMIC_QUERIES + 3),
+    )
+)
+def test_write_paths_query_count(
+    author_client, comment, django_assert_num_queries,
+    method, name, args, data, expected_queries
+):
+    url = reverse(name, args=args)
+    with django_assert_num_queries(expected_queries):
+        getattr(author_client, method)(url, data)
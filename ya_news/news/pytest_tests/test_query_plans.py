@@ -0,0 +1,54 @@
+import re
+
+import pytest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from news.models import Comment
+from news.pagination import encode_cursor
+
+FULL_SCAN = re.compile(r'^SCAN (TABLE )?\w+$')
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+@pytest.fixture
+def comments(author, news):
+    return Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Comment {i}')
+        for i in range(3)
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'name, args, params',
+    (
+        ('news:home', (), {}),
+        ('news:detail', pytest.lazy_fixture('news_id'), {}),
+        ('news:comments', pytest.lazy_fixture('news_id'), {}),
+        ('news:edit', pytest.lazy_fixture('comment_id'), {}),
+        ('news:delete', pytest.lazy_fixture('comment_id'), {}),
+    )
+)
+def test_views_use_indexes(author_client, comments, name, args, params):
+    if name == 'news:comments':
+        params = {'after': encode_cursor(Comment.objects.first())}
+    with CaptureQueriesContext(connection) as context:
+        author_client.get(reverse(name, args=args), params)
+
+    queries = [
+        query['sql'] for query in context.captured_queries
+        if 'news_' in query['sql'] and query['sql'].startswith('SELECT')
+    ]
+    assert queries
+    for sql in queries:
+        plan = explain(sql)
+        assert not any(FULL_SCAN.match(step) for step in plan), (sql, plan)
+        assert not any('TEMP B-TREE' in step for step in plan), (sql, plan)
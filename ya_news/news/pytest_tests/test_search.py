@@ -0,0 +1,84 @@
+from io import StringIO
+
+import pytest
+
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+
+from news.models import Comment, News
+from news.search import COMMENT, NEWS, search
+
+
+@pytest.fixture
+def corpus(author):
+    news = News.objects.create(
+        title='Программисты', text='Новость о программировании на Python'
+    )
+    comment = Comment.objects.create(
+        news=news, author=author, text='Программирование <b>полезно</b>'
+    )
+    return news, comment
+
+
+@pytest.mark.django_db
+def test_search_finds_news_and_comments_by_prefix(corpus):
+    news, comment = corpus
+
+    results = search('програм')
+
+    assert {(result.kind, result.object_id) for result in results} == {
+        (NEWS, news.id), (COMMENT, comment.id),
+    }
+    assert all(result.news_id == news.id for result in results)
+
+
+@pytest.mark.django_db
+def test_search_snippet_is_highlighted_and_escaped(corpus):
+    _, comment = corpus
+
+    result, = search('полезно')
+
+    assert result.object_id == comment.id
+    assert result.snippet == (
+        'Программирование &lt;b&gt;<mark>полезно</mark>&lt;/b&gt;'
+    )
+
+
+@pytest.mark.django_db
+def test_search_index_follows_updates_and_deletes(corpus):
+    news, comment = corpus
+
+    comment.text = 'Совсем другой текст'
+    comment.save()
+    assert [result.kind for result in search('програм')] == [NEWS]
+    assert [result.object_id for result in search('другой')] == [comment.id]
+
+    news.delete()
+    assert search('програм') == []
+    assert search('другой') == []
+
+
+@pytest.mark.django_db
+def test_search_ignores_query_syntax(corpus):
+    assert search('"') == []
+    assert search('NOT AND (') == []
+
+
+@pytest.mark.django_db
+def test_backfill_search_index(corpus):
+    with connection.cursor() as cursor:
+        cursor.execute('DELETE FROM news_search')
+    assert search('програм') == []
+
+    call_command('backfill_search_index', batch_size=1, stdout=StringIO())
+
+    assert len(search('програм')) == 2
+
+
+@pytest.mark.django_db
+def test_search_page(client, corpus):
+    response = client.get(reverse('news:search'), {'q': 'python'})
+
+    assert [result.kind for result in response.context['results']] == [NEWS]
+    assert '<mark>Python</mark>' in response.content.decode()
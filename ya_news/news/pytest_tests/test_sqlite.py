@@ -0,0 +1,23 @@
+import pytest
+
+from django.db import connection
+
+from yanews.sqlite.base import DatabaseWrapper
+
+
+@pytest.mark.django_db
+def test_production_profile_applies_pragmas(tmp_path):
+    wrapper = DatabaseWrapper(
+        {**connection.settings_dict, 'NAME': str(tmp_path / 'db.sqlite3')},
+        alias='production',
+    )
+    try:
+        with wrapper.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            assert cursor.fetchone() == ('wal',)
+            cursor.execute('PRAGMA synchronous')
+            assert cursor.fetchone() == (1,)
+            cursor.execute('PRAGMA busy_timeout')
+            assert cursor.fetchone() == (5000,)
+    finally:
+        wrapper.close()
@@ -0,0 +1,85 @@
+import datetime
+import random
+
+import pytest
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+
+from news.models import Comment, News
+from news.synthetic import generate, skewed_counts
+
+
+ANCHOR = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def snapshot():
+    news = list(News.objects.order_by('pk').values_list(
+        'title', 'text', 'date', 'updated', 'comment_count'
+    ))
+    comments = list(Comment.objects.order_by('pk').values_list(
+        'text', 'created', 'updated'
+    ))
+    return news, comments
+
+
+@pytest.mark.parametrize('total, buckets', [(0, 3), (10, 3), (1000, 17)])
+def test_skewed_counts_sum_to_total(total, buckets):
+    counts = skewed_counts(total, buckets, random.Random(1))
+    assert len(counts) == buckets
+    assert sum(counts) == total
+
+
+@pytest.mark.django_db
+def test_generates_requested_volume():
+    generated = generate(users=10, news=40, comments=1500, seed=3,
+                         batch_size=64)
+
+    assert generated.comments == 1500
+    assert News.objects.count() == 40
+    assert Comment.objects.count() == 1500
+    assert get_user_model().objects.filter(
+        pk__in=generated.users
+    ).count() == 10
+
+
+@pytest.mark.django_db
+def test_comment_counters_match_comments():
+    generate(users=10, news=40, comments=1500, seed=3)
+
+    counts = News.objects.annotate(
+        total=Count('comment')
+    ).values_list('comment_count', 'total')
+    assert all(counter == total for counter, total in counts)
+
+
+@pytest.mark.django_db
+def test_comments_per_news_are_skewed():
+    generate(users=10, news=100, comments=5000, seed=3)
+
+    busiest = News.objects.order_by('-comment_count').first()
+    assert busiest.comment_count > 5 * 5000 / 100
+
+
+@pytest.mark.django_db
+def test_comments_follow_news_date():
+    generate(users=3, news=5, comments=50, seed=3)
+
+    for news in News.objects.all():
+        created = list(news.comment_set.values_list('created', flat=True))
+        assert created == sorted(created)
+        assert all(moment.date() >= news.date for moment in created)
+
+
+@pytest.mark.django_db
+def test_same_seed_gives_same_data():
+    generate(users=5, news=20, comments=300, seed=7, now=ANCHOR)
+    first = snapshot()
+    News.objects.all().delete()
+
+    generate(users=5, news=20, comments=300, seed=7, now=ANCHOR)
+    assert snapshot() == first
+
+    News.objects.all().delete()
+    generate(users=5, news=20, comments=300, seed=8, now=ANCHOR)
+    assert snapshot() != first
@@ -0,0 +1,143 @@
+import re
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Comment
+
+SearchResult = namedtuple(
+    'SearchResult', ('kind', 'object_id', 'news_id', 'title', 'snippet')
+)
+
+NEWS = 'news'
+COMMENT = 'comment'
+# Маркеры подсветки, которых не бывает в пользовательском тексте:
+# сниппет сначала экранируется, и только потом они меняются на <mark>.
+MARK_START, MARK_END = '\x02', '\x03'
+
+SEARCH_SQL = f"""
+    SELECT
+        news_search.rowid,
+        news_search.news_id,
+        news_news.title,
+        snippet(news_search, 1, '{MARK_START}', '{MARK_END}', '…', 16)
+    FROM news_search
+    JOIN news_news ON news_news.id = news_search.news_id
+    LEFT JOIN news_comment
+        ON news_search.rowid %% 2 = 1
+        AND news_comment.id = news_search.rowid / 2
+    WHERE news_search MATCH %s
+        AND (news_search.rowid %% 2 = 0 OR news_comment.status = %s)
+    ORDER BY rank
+    LIMIT %s
+"""
+
+BACKFILL_SQL = {
+    NEWS: """
+        INSERT OR REPLACE INTO news_search (rowid, title, body, news_id)
+        SELECT id * 2, title, text, id FROM news_news
+        WHERE id > %s AND id <= %s
+    """,
+    COMMENT: """
+        INSERT OR REPLACE INTO news_search (rowid, title, body, news_id)
+        SELECT id * 2 + 1, '', text, news_id FROM news_comment
+        WHERE id > %s AND id <= %s
+    """,
+}
+
+# id новостей или комментариев, подходящих под запрос, — для фильтра
+# в админке: rowid новости чётный, комментария — нечётный.
+MATCHING_IDS_SQL = {
+    NEWS: """
+        SELECT rowid / 2 FROM news_search
+        WHERE news_search MATCH %s AND rowid %% 2 = 0
+    """,
+    COMMENT: """
+        SELECT rowid / 2 FROM news_search
+        WHERE news_search MATCH %s AND rowid %% 2 = 1
+    """,
+}
+
+BATCH_END_SQL = """
+    SELECT max(id) FROM (
+        SELECT id FROM {table} WHERE id > %s ORDER BY id LIMIT %s
+    )
+"""
+
+
+def build_query(text):
+    """
+    Превращает ввод пользователя в запрос FTS5.
+
+    Каждое слово ищется по префиксу, все слова должны встретиться.
+    Кавычки и операторы FTS5 из ввода отбрасываются.
+    """
+    return ' '.join(f'"{term}"*' for term in re.findall(r'\w+', text))
+
+
+def highlight(snippet):
+    return mark_safe(
+        escape(snippet).replace(MARK_START, '<mark>').replace(
+            MARK_END, '</mark>'
+        )
+    )
+
+
+def search(text, limit=None):
+    """Новости и одобренные комментарии по запросу, по убыванию BM25."""
+    query = build_query(text)
+    if not query:
+        return []
+    limit = limit or settings.NEWS_SEARCH_RESULTS
+    with connection.cursor() as cursor:
+        cursor.execute(SEARCH_SQL, (query, Comment.Status.APPROVED, limit))
+        rows = cursor.fetchall()
+    return [
+        SearchResult(
+            COMMENT if rowid % 2 else NEWS,
+            rowid // 2,
+            news_id,
+            title,
+            highlight(snippet),
+        )
+        for rowid, news_id, title, snippet in rows
+    ]
+
+
+def filter_matching(queryset, text, kind):
+    """Оставляет в queryset новости или комментарии, подходящие под запрос."""
+    query = build_query(text)
+    if not query:
+        return queryset.none()
+    return queryset.filter(
+        pk__in=RawSQL(MATCHING_IDS_SQL[kind], (query,))
+    )
+
+
+def backfill(kind, batch_size):
+    """
+    Добавляет в индекс уже существующие строки пачками.
+
+    Каждая пачка пишется в своей транзакции, поэтому индексирование
+    больших таблиц не держит блокировку на запись всё время.
+    Возвращает генератор с числом обработанных строк после каждой пачки.
+    """
+    table = 'news_news' if kind == NEWS else 'news_comment'
+    last_id = 0
+    total = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                BATCH_END_SQL.format(table=table), (last_id, batch_size)
+            )
+            batch_end = cursor.fetchone()[0]
+            if batch_end is None:
+                return
+            cursor.execute(BACKFILL_SQL[kind], (last_id, batch_end))
+            total += cursor.rowcount
+        last_id = batch_end
+        yield total
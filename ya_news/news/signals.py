@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import HOME, bump_versions
+from .models import News
+
+
+@receiver((post_save, post_delete), sender=News)
+def news_changed(sender, instance, **kwargs):
+    """Изменение новости делает устаревшими её страницу и главную."""
+    bump_versions(instance.pk, HOME)
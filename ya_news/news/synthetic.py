@@ -0,0 +1,169 @@
+"""
+Синтетические пользователи, новости и комментарии для проверки
+масштабирования.
+
+Всё определяется зерном генератора и моментом now, к которому
+отсчитываются даты: при тех же зерне, now и пустой базе получаются
+те же строки, включая даты. id назначаются заранее, начиная после
+наибольшего существующего, поэтому связи собираются без чтения из базы,
+а строки пишутся пачками по мере генерации и в памяти не копятся.
+"""
+import datetime
+import itertools
+import random
+from collections import namedtuple
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .bulk import explicit_timestamps
+from .models import Comment, News
+
+WORDS = (
+    'город', 'новость', 'выставка', 'погода', 'мост', 'школа', 'музей',
+    'концерт', 'рынок', 'дорога', 'парк', 'библиотека', 'фестиваль',
+    'вокзал', 'театр', 'стадион', 'весна', 'зима', 'ремонт', 'выборы',
+    'жители', 'открытие', 'транспорт', 'снег', 'праздник', 'спектакль',
+    'набережная', 'больница', 'премьера', 'турнир',
+)
+
+# Пароль, с которым нельзя войти: как у set_unusable_password().
+UNUSABLE_PASSWORD = '!'
+
+# За сколько дней до сегодняшнего распределены даты новостей.
+HISTORY_DAYS = 365
+
+# Тексты комментариев берутся из заранее собранного набора: сборка
+# фразы на каждый из миллионов комментариев заметно дороже записи.
+COMMENT_TEXTS = 4096
+
+Generated = namedtuple('Generated', 'users news comments')
+
+
+def skewed_counts(total, buckets, rng, skew=1.0):
+    """
+    Раскладывает total по buckets по закону Ципфа.
+
+    Доля корзины ранга r пропорциональна 1 / r ** skew, ранги
+    перемешаны, сумма счётчиков ровно total.
+    """
+    if not buckets:
+        return []
+    weights = [1 / rank ** skew for rank in range(1, buckets + 1)]
+    rng.shuffle(weights)
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    for index in rng.sample(range(buckets), total - sum(counts)):
+        counts[index] += 1
+    return counts
+
+
+def phrase(rng, words, max_length):
+    text = ' '.join(rng.choices(WORDS, k=words))
+    return text[:max_length].capitalize()
+
+
+def next_pk(model, using):
+    last = model.objects.using(using).aggregate(last=Max('pk'))['last']
+    return (last or 0) + 1
+
+
+def write(model, objs, batch_size, using, on_batch=None):
+    """Пишет объекты пачками, каждую — в своей транзакции."""
+    objs = iter(objs)
+    while True:
+        batch = list(itertools.islice(objs, batch_size))
+        if not batch:
+            return
+        with transaction.atomic(using=using):
+            model.objects.using(using).bulk_create(batch)
+        if on_batch is not None:
+            on_batch(len(batch))
+
+
+def generate_users(count, batch_size, using, on_batch=None):
+    User = get_user_model()
+    first = next_pk(User, using)
+    pks = range(first, first + count)
+    write(
+        User,
+        (
+            User(
+                pk=pk, username=f'synthetic-{pk}',
+                password=UNUSABLE_PASSWORD,
+            )
+            for pk in pks
+        ),
+        batch_size, using, on_batch,
+    )
+    return pks
+
+
+def published(index, total, now):
+    """Время публикации: новости с большим id новее."""
+    return now - datetime.timedelta(days=HISTORY_DAYS) * (
+        1 - index / max(total, 1)
+    )
+
+
+def build_news(rng, pks, counts, now):
+    title_length = News._meta.get_field('title').max_length
+    for index, (pk, count) in enumerate(zip(pks, counts)):
+        moment = published(index, len(pks), now)
+        yield News(
+            pk=pk,
+            title=phrase(rng, rng.randint(3, 6), title_length),
+            text=phrase(rng, rng.randint(30, 80), 2000),
+            date=moment.date(),
+            comment_count=count,
+            updated=moment,
+        )
+
+
+def build_comments(rng, news_pks, counts, author_pks, now):
+    """Комментарии новостей по порядку; время растёт внутри новости."""
+    texts = [
+        phrase(rng, rng.randint(3, 25), 500) for _ in range(COMMENT_TEXTS)
+    ]
+    for index, (news_pk, count) in enumerate(zip(news_pks, counts)):
+        moment = published(index, len(news_pks), now)
+        gap = now - moment
+        for number in range(count):
+            created = moment + gap * ((number + rng.random()) / count)
+            yield Comment(
+                news_id=news_pk,
+                author_id=rng.choice(author_pks),
+                text=rng.choice(texts),
+                created=created,
+                updated=created,
+            )
+
+
+def generate(users, news, comments, seed=0, skew=1.0, batch_size=10_000,
+             using='default', on_batch=None, now=None):
+    """
+    Создаёт пользователей, новости и комментарии к ним.
+
+    Комментарии раскладываются по новостям неравномерно (см.
+    skewed_counts), счётчик comment_count заполняется сразу. Даты
+    лежат в HISTORY_DAYS до now, по умолчанию — до текущего момента.
+    on_batch вызывается с числом строк после каждой записанной пачки.
+    """
+    rng = random.Random(seed)
+    now = now or timezone.now()
+    author_pks = generate_users(users, batch_size, using, on_batch)
+    first = next_pk(News, using)
+    news_pks = range(first, first + news)
+    counts = skewed_counts(comments if users else 0, news, rng, skew)
+    with explicit_timestamps(News), explicit_timestamps(Comment):
+        write(
+            News, build_news(rng, news_pks, counts, now),
+            batch_size, using, on_batch,
+        )
+        write(
+            Comment, build_comments(rng, news_pks, counts, author_pks, now),
+            batch_size, using, on_batch,
+        )
+    return Generated(author_pks, news_pks, sum(counts))
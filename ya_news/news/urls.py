@@ -1,12 +1,24 @@
 from django.urls import path
 
-from news import views
+from news import api, views
 
 app_name = 'news'
 
 urlpatterns = [
     path('', views.NewsList.as_view(), name='home'),
     path('news/<int:pk>/', views.NewsDetailView.as_view(), name='detail'),
+    path(
+        'news/<int:pk>/comments/',
+        views.NewsComments.as_view(),
+        name='comments'
+    ),
+    path('search/', views.NewsSearch.as_view(), name='search'),
+    path('api/news/', api.NewsFeed.as_view(), name='api_news'),
+    path(
+        'api/news/<int:pk>/comments/',
+        api.CommentsFeed.as_view(),
+        name='api_comments'
+    ),
     path(
         'delete_comment/<int:pk>/',
         views.CommentDelete.as_view(),
@@ -1,14 +1,45 @@
 from django.conf import settings
+from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import get_object_or_404
+from django.db import transaction
+from django.db.models import F
 from django.urls import reverse
+from django.utils import timezone
 from django.views import generic
 
+from .cache import HOME, AnonymousPageCacheMixin, bump_versions, get_version
 from .forms import CommentForm
 from .models import Comment, News
+from .pagination import CommentsPage
+from .search import search
 
+AWAITING_MODERATION = 'Комментарий появится после проверки модератором.'
 
-class NewsList(generic.ListView):
+
+def decrement_comment_count(news_id):
+    News.objects.filter(pk=news_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1, updated=timezone.now()
+    )
+
+
+class CommentsPageMixin:
+    """Добавляет в контекст страницу комментариев к новости."""
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        user = self.request.user
+        context['comments_page'] = CommentsPage(
+            self.kwargs['pk'], self.request.GET.get('after'),
+            author=user if user.is_authenticated else None,
+        )
+        context['comments_version'] = get_version(self.kwargs['pk'])
+        return context
+
+    def get_cache_versions(self):
+        return (self.kwargs['pk'],)
+
+
+class NewsList(AnonymousPageCacheMixin, generic.ListView):
     """Список новостей."""
     model = News
     template_name = 'news/home.html'
@@ -19,22 +50,18 @@ class NewsList(generic.ListView):
 
         Их количество определяется в настройках проекта.
         """
-        return self.model.objects.prefetch_related(
-            'comment_set'
-        )[:settings.NEWS_COUNT_ON_HOME_PAGE]
+        return self.model.objects.all()[:settings.NEWS_COUNT_ON_HOME_PAGE]
+
+    def get_cache_versions(self):
+        return (HOME,)
 
 
-class NewsDetail(generic.DetailView):
+class NewsDetail(
+        CommentsPageMixin, AnonymousPageCacheMixin, generic.DetailView
+):
     model = News
     template_name = 'news/detail.html'
 
-    def get_object(self, queryset=None):
-        obj = get_object_or_404(
-            self.model.objects.prefetch_related('comment_set__author'),
-            pk=self.kwargs['pk']
-        )
-        return obj
-
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         if self.request.user.is_authenticated:
@@ -44,6 +71,7 @@ class NewsDetail(generic.DetailView):
 
 class NewsComment(
         LoginRequiredMixin,
+        CommentsPageMixin,
         generic.detail.SingleObjectMixin,
         generic.FormView
 ):
@@ -56,26 +84,51 @@ class NewsComment(
         return super().post(request, *args, **kwargs)
 
     def form_valid(self, form):
+        """Сохраняет комментарий в очередь модерации."""
         comment = form.save(commit=False)
         comment.news = self.object
         comment.author = self.request.user
+        comment.status = Comment.Status.PENDING
         comment.save()
+        # Счётчик не меняется, но автор видит свой комментарий
+        # в кешированном списке.
+        bump_versions(self.object.pk)
+        messages.info(self.request, AWAITING_MODERATION)
         return super().form_valid(form)
 
     def get_success_url(self):
-        post = self.get_object()
-        return reverse('news:detail', kwargs={'pk': post.pk}) + '#comments'
+        return reverse(
+            'news:detail', kwargs={'pk': self.object.pk}
+        ) + '#comments'
 
 
 class NewsDetailView(generic.View):
+    detail_view = staticmethod(NewsDetail.as_view())
+    comment_view = staticmethod(NewsComment.as_view())
 
     def get(self, request, *args, **kwargs):
-        view = NewsDetail.as_view()
-        return view(request, *args, **kwargs)
+        return self.detail_view(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
-        view = NewsComment.as_view()
-        return view(request, *args, **kwargs)
+        return self.comment_view(request, *args, **kwargs)
+
+
+class NewsComments(
+        CommentsPageMixin, AnonymousPageCacheMixin, generic.TemplateView
+):
+    """Следующая страница комментариев к новости."""
+    template_name = 'news/includes/comments.html'
+
+
+class NewsSearch(generic.TemplateView):
+    """Полнотекстовый поиск по новостям и комментариям."""
+    template_name = 'news/search.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.request.GET.get('q', '')
+        context['results'] = search(context['query'])
+        return context
 
 
 class CommentBase(LoginRequiredMixin):
@@ -83,14 +136,15 @@ class CommentBase(LoginRequiredMixin):
     model = Comment
 
     def get_success_url(self):
-        comment = self.get_object()
         return reverse(
-            'news:detail', kwargs={'pk': comment.news.pk}
+            'news:detail', kwargs={'pk': self.object.news_id}
         ) + '#comments'
 
     def get_queryset(self):
         """Пользователь может работать только со своими комментариями."""
-        return self.model.objects.filter(author=self.request.user)
+        return self.model.objects.filter(
+            author=self.request.user
+        ).select_related('news')
 
 
 class CommentUpdate(CommentBase, generic.UpdateView):
@@ -98,7 +152,35 @@ class CommentUpdate(CommentBase, generic.UpdateView):
     template_name = 'news/edit.html'
     form_class = CommentForm
 
+    def form_valid(self, form):
+        """
+        Исправленный текст заново проходит модерацию.
+
+        Статус снимается условным UPDATE: комментарий мог быть одобрен
+        после того, как его прочитал этот запрос, и счётчик уменьшается
+        по тому, что было в базе.
+        """
+        form.instance.status = Comment.Status.PENDING
+        with transaction.atomic():
+            approved = Comment.objects.filter(
+                pk=form.instance.pk, status=Comment.Status.APPROVED
+            ).update(status=Comment.Status.PENDING)
+            response = super().form_valid(form)
+            if approved:
+                decrement_comment_count(self.object.news_id)
+        bump_versions(self.object.news_id, HOME)
+        messages.info(self.request, AWAITING_MODERATION)
+        return response
+
 
 class CommentDelete(CommentBase, generic.DeleteView):
     """Удаление комментария."""
     template_name = 'news/delete.html'
+
+    def delete(self, request, *args, **kwargs):
+        with transaction.atomic():
+            response = super().delete(request, *args, **kwargs)
+            if self.object.status == Comment.Status.APPROVED:
+                decrement_comment_count(self.object.news_id)
+        bump_versions(self.object.news_id, HOME)
+        return response
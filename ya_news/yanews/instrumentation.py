@@ -0,0 +1,197 @@
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Верхние границы корзин гистограммы времени ответа, мс.
+BUCKETS = (
+    1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float('inf')
+)
+METRICS = ('queries', 'sql_ms', 'render_ms', 'bytes', 'wall_ms')
+
+
+def new_stats():
+    return {
+        'count': 0,
+        **dict.fromkeys(METRICS, 0),
+        'max_ms': 0,
+        'buckets': [0] * len(BUCKETS),
+    }
+
+
+def merge_stats(total, stats):
+    """Прибавляет к total счётчики stats того же вида."""
+    total['count'] += stats['count']
+    for metric in METRICS:
+        total[metric] += stats[metric]
+    total['max_ms'] = max(total['max_ms'], stats['max_ms'])
+    total['buckets'] = [
+        mine + theirs for mine, theirs in zip(total['buckets'],
+                                              stats['buckets'])
+    ]
+    return total
+
+
+def percentile(stats, share):
+    """Оценка перцентиля по гистограмме: верхняя граница корзины."""
+    rank = share * stats['count']
+    seen = 0
+    for bound, count in zip(BUCKETS, stats['buckets']):
+        seen += count
+        if count and seen >= rank:
+            return min(bound, stats['max_ms'])
+    return stats['max_ms']
+
+
+class Recorder:
+    """
+    Скользящая статистика запросов процесса по имени URL.
+
+    Статистика копится окнами по PERF_WINDOW секунд, хранятся последние
+    PERF_WINDOWS окон. Раз в PERF_FLUSH_INTERVAL секунд снимок пишется
+    в PERF_STATS_DIR/<pid>.json, откуда его читает команда perf_stats.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.windows = deque(maxlen=settings.PERF_WINDOWS)
+            self._flushed = time.monotonic()
+
+    def record(self, view, values):
+        now = time.time()
+        with self._lock:
+            if not self.windows or (
+                now - self.windows[-1][0] >= settings.PERF_WINDOW
+            ):
+                self.windows.append((now, {}))
+            stats = self.windows[-1][1].setdefault(view, new_stats())
+            stats['count'] += 1
+            for metric in METRICS:
+                stats[metric] += values[metric]
+            wall_ms = values['wall_ms']
+            stats['max_ms'] = max(stats['max_ms'], wall_ms)
+            stats['buckets'][
+                next(i for i, bound in enumerate(BUCKETS) if wall_ms <= bound)
+            ] += 1
+            flush = (
+                time.monotonic() - self._flushed
+                >= settings.PERF_FLUSH_INTERVAL
+            )
+            if flush:
+                self._flushed = time.monotonic()
+        if flush:
+            self.flush()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'windows': [
+                    {'started': started, 'views': copy.deepcopy(views)}
+                    for started, views in self.windows
+                ],
+            }
+
+    def flush(self):
+        directory = settings.PERF_STATS_DIR
+        if not directory:
+            return
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'{os.getpid()}.json'
+        temporary = path.with_suffix('.tmp')
+        temporary.write_text(json.dumps(self.snapshot()))
+        os.replace(temporary, path)
+
+
+recorder = Recorder()
+
+
+class RequestTimer:
+    """Число и время SQL-запросов и время отрисовки шаблона."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql = 0.0
+        self.render = 0.0
+        self._render_started = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql += time.perf_counter() - started
+
+    def start_render(self):
+        self._render_started = time.perf_counter()
+
+    def stop_render(self, response):
+        self.render += time.perf_counter() - self._render_started
+
+
+class InstrumentationMiddleware:
+    """
+    Замеряет каждый запрос и складывает замеры в recorder.
+
+    Считает SQL-запросы и их время, время отрисовки TemplateResponse
+    (с ленивыми запросами внутри шаблона), размер ответа и общее время.
+    Итог уходит в заголовок Server-Timing и строку лога. Накладные
+    расходы — пара perf_counter на запрос к базе.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = request._instrumentation = RequestTimer()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        values = {
+            'queries': timer.queries,
+            'sql_ms': timer.sql * 1000,
+            'render_ms': timer.render * 1000,
+            'bytes': 0 if response.streaming else len(response.content),
+            'wall_ms': (time.perf_counter() - started) * 1000,
+        }
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        response['Server-Timing'] = (
+            f'db;dur={values["sql_ms"]:.1f};desc="{timer.queries} queries", '
+            f'render;dur={values["render_ms"]:.1f}, '
+            f'total;dur={values["wall_ms"]:.1f}'
+        )
+        logger.info(
+            'view=%s method=%s status=%s queries=%d sql_ms=%.1f '
+            'render_ms=%.1f bytes=%d wall_ms=%.1f',
+            view, request.method, response.status_code, timer.queries,
+            values['sql_ms'], values['render_ms'], values['bytes'],
+            values['wall_ms'],
+        )
+        recorder.record(view, values)
+        return response
+
+    def process_template_response(self, request, response):
+        request._instrumentation.start_render()
+        response.add_post_render_callback(
+            request._instrumentation.stop_render
+        )
+        return response
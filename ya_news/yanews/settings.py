@@ -1,3 +1,5 @@
+import os
+import tempfile
 from pathlib import Path
 
 from django.urls import reverse_lazy
@@ -21,6 +23,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'yanews.instrumentation.InstrumentationMiddleware',
+    'yanews.nplusone.NPlusOneMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -58,6 +62,28 @@ DATABASES = {
     }
 }
 
+# Профиль SQLite: 'default' или 'production' (WAL, настроенные PRAGMA
+# и постоянные соединения). Выбирается переменной окружения.
+SQLITE_PROFILE = os.getenv('SQLITE_PROFILE', 'default')
+
+if SQLITE_PROFILE == 'production':
+    DATABASES['default'].update({
+        'ENGINE': 'yanews.sqlite',
+        'CONN_MAX_AGE': 600,
+    })
+
+# Кеш страниц и фрагментов новостей. Чтобы включить его, замените
+# DummyCache, например, на locmem.LocMemCache или
+# filebased.FileBasedCache.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'news': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    },
+}
+
 
 AUTH_PASSWORD_VALIDATORS = []
 
@@ -80,3 +106,57 @@ LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('news:home')
 
 NEWS_COUNT_ON_HOME_PAGE = 10
+
+COMMENTS_PER_PAGE = 50
+
+NEWS_SEARCH_RESULTS = 20
+
+# Админка: сколько последних комментариев показывать на странице новости
+# и до скольких строк считать списки.
+ADMIN_INLINE_COMMENTS = 20
+ADMIN_COUNT_LIMIT = 10_000
+
+# Модерация комментариев: правила, которыми команда moderate_comments
+# проверяет пачки новых комментариев, размер пачки и число процессов.
+MODERATION_RULES = [
+    'news.moderation.bad_words_rule',
+    'news.moderation.links_rule',
+]
+MODERATION_BATCH_SIZE = 500
+MODERATION_WORKERS = 2
+MODERATION_MAX_LINKS = 3
+
+# Замеры запросов: скользящие окна статистики и каталог, куда процессы
+# сбрасывают её для команды perf_stats.
+PERF_WINDOW = 300
+PERF_WINDOWS = 12
+PERF_FLUSH_INTERVAL = 10
+PERF_STATS_DIR = Path(tempfile.gettempdir()) / 'yanews-perf'
+
+# Поиск N+1: сколько одинаковых запросов считать повтором, бросать ли
+# исключение (включается в тестах) и какие повторы допустимы.
+NPLUSONE_THRESHOLD = 3
+NPLUSONE_RAISE = False
+NPLUSONE_ALLOW = []
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'yanews.instrumentation': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+        'yanews.nplusone': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+        'news.moderation': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+    },
+}
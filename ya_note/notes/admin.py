@@ -2,4 +2,14 @@ from django.contrib import admin
 
 from .models import Note
 
-admin.site.register(Note)
+
+@admin.register(Note)
+class NoteAdmin(admin.ModelAdmin):
+    list_display = ('title', 'slug', 'author')
+    list_select_related = ('author',)
+    raw_id_fields = ('author',)
+    ordering = ('-id',)
+    # Точное совпадение идёт по уникальному индексу slug. Префикс '='
+    # дал бы iexact, то есть LIKE и полный просмотр таблицы.
+    search_fields = ('slug__exact',)
+    show_full_result_count = False
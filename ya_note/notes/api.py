@@ -0,0 +1,110 @@
+import json
+
+from django.conf import settings
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import IntegrityError
+from django.http import JsonResponse
+from django.views import generic
+
+from .batch import BatchError, apply_batch
+from .models import Note
+from .pagination import get_notes_page
+from .search import parse_limit, search_notes
+from .sync import SyncReset, get_changes, parse_since
+
+NOTE_FIELDS = ('id', 'title', 'text', 'slug')
+
+
+class ApiBase(LoginRequiredMixin):
+    """Базовый класс для JSON API: вместо редиректа на вход — 403."""
+    raise_exception = True
+
+
+class NotesListApi(ApiBase, generic.View):
+    """Страница заметок пользователя с курсором следующей страницы."""
+
+    def get(self, request):
+        notes, next_cursor = get_notes_page(
+            Note.objects.filter(author=request.user).values(*NOTE_FIELDS),
+            request.GET.get('after'),
+        )
+        return JsonResponse({'results': notes, 'next_cursor': next_cursor})
+
+
+class NotesSearchApi(ApiBase, generic.View):
+    """Поиск по заметкам пользователя."""
+
+    def get(self, request):
+        results = search_notes(
+            request.user,
+            request.GET.get('q', ''),
+            parse_limit(request.GET.get('limit')),
+        )
+        return JsonResponse(
+            {'results': [result._asdict() for result in results]}
+        )
+
+
+class NotesSyncApi(ApiBase, generic.View):
+    """
+    Изменения заметок пользователя после номера since.
+
+    Если надгробия после since уже сжаты, отвечает 410: клиенту нужно
+    начать заново с since=0.
+    """
+
+    def get(self, request):
+        try:
+            changes = get_changes(
+                request.user,
+                parse_since(request.GET.get('since')),
+                parse_limit(request.GET.get('limit')),
+            )
+        except SyncReset:
+            return JsonResponse({'reset': True}, status=410)
+        return JsonResponse(changes._asdict())
+
+
+class NotesBatchApi(ApiBase, generic.View):
+    """
+    Пакетное создание, изменение и удаление заметок.
+
+    Тело запроса — JSON вида {"create": [...], "update": [...],
+    "delete": [...]}; в ответе у каждого элемента либо заметка, либо
+    ошибки формы.
+    """
+
+    def post(self, request):
+        try:
+            payload = json.loads(request.body)
+            if not isinstance(payload, dict):
+                raise BatchError('Ожидается JSON-объект.')
+            batch = {
+                name: payload.get(name, [])
+                for name in ('create', 'update', 'delete')
+            }
+            if not all(isinstance(items, list) for items in batch.values()):
+                raise BatchError('create, update и delete — списки.')
+            if sum(map(len, batch.values())) > settings.NOTES_BATCH_LIMIT:
+                raise BatchError(
+                    f'Не больше {settings.NOTES_BATCH_LIMIT} элементов.'
+                )
+            results = apply_batch(request.user, **batch)
+        except ValueError as error:
+            return JsonResponse({'error': str(error)}, status=400)
+        except IntegrityError:
+            # Slug заняли параллельным запросом: пакет можно повторить.
+            return JsonResponse(
+                {'error': 'Конфликт slug, повторите запрос.'}, status=409
+            )
+        return JsonResponse({
+            name: [
+                {'ok': True, 'note': {
+                    field: getattr(result.note, field)
+                    for field in NOTE_FIELDS
+                }} if result.errors is None
+                else {'ok': False, 'errors': result.errors}
+                for result in items
+            ]
+            for name, items in results.items()
+        })
@@ -0,0 +1,187 @@
+from collections import namedtuple
+
+from django.db import transaction
+
+from .cache import note_cache
+from .forms import WARNING, NoteForm
+from .models import ChangeSequence, Note
+from .slugs import make_slug_base, next_free_slug, taken_slugs
+
+NOT_FOUND = 'Заметка не найдена.'
+SLUG_MAX_LENGTH = Note._meta.get_field('slug').max_length
+
+BatchResult = namedtuple('BatchResult', ('note', 'errors'))
+
+
+class BatchError(ValueError):
+    """Пакет целиком не разобрать: неверная структура или повтор id."""
+
+
+class BatchNoteForm(NoteForm):
+    """NoteForm без запроса к базе на каждый slug: пакет проверяет их разом."""
+
+    def clean_slug(self):
+        return self.cleaned_data.get('slug')
+
+
+def parse_ids(items, name):
+    ids = []
+    for item in items:
+        note_id = item.get('id') if isinstance(item, dict) else item
+        if not isinstance(note_id, int) or isinstance(note_id, bool):
+            raise BatchError(f'{name}: у каждого элемента нужен числовой id.')
+        ids.append(note_id)
+    return ids
+
+
+def claim_slugs(forms, owners):
+    """
+    Проверяет уникальность явных slug всего пакета одним запросом.
+
+    Slug занят, если в базе он принадлежит другой заметке или его уже
+    забрал элемент пакета раньше. Прежние slug переименованных и
+    удаляемых заметок тоже считаются занятыми: так порядок записи внутри
+    транзакции не важен.
+    """
+    wanted = {
+        form.instance.slug for form in forms
+        if form.instance.slug and form.instance.slug != owners.get(form)
+    }
+    in_database = dict(
+        Note.objects.filter(slug__in=wanted).values_list('slug', 'id')
+    ) if wanted else {}
+    claimed = set()
+    for form in forms:
+        slug = form.instance.slug
+        if not slug:
+            continue
+        owner = in_database.get(slug)
+        if slug in claimed or owner not in (None, form.instance.pk):
+            form.add_error('slug', slug + WARNING)
+        else:
+            claimed.add(slug)
+    return claimed
+
+
+def fill_slugs(notes, claimed):
+    """Свободные slug для заметок без slug: один запрос на весь пакет."""
+    if not notes:
+        return
+    bases = [make_slug_base(note.title, SLUG_MAX_LENGTH) for note in notes]
+    taken = claimed | taken_slugs(
+        Note.objects.all(), set(bases), SLUG_MAX_LENGTH
+    )
+    for note, base in zip(notes, bases):
+        note.slug = next_free_slug(base, taken, SLUG_MAX_LENGTH)
+        taken.add(note.slug)
+
+
+def check_batch(create, update, delete):
+    """Проверяет структуру пакета и возвращает id из update и delete."""
+    for name, items in (('create', create), ('update', update)):
+        if not all(isinstance(item, dict) for item in items):
+            raise BatchError(f'{name}: каждый элемент должен быть объектом.')
+    update_ids = parse_ids(update, 'update')
+    delete_ids = parse_ids(delete, 'delete')
+    if len(set(update_ids + delete_ids)) < len(update_ids) + len(delete_ids):
+        raise BatchError('Одна заметка встречается в пакете дважды.')
+    return update_ids, delete_ids
+
+
+def bind_update_forms(existing, update_ids, update):
+    """
+    Формы изменения поверх текущих значений заметок.
+
+    Возвращает формы (None для чужих и несуществующих заметок) и
+    прежние slug изменяемых заметок по форме.
+    """
+    forms, owners = [], {}
+    for note_id, item in zip(update_ids, update):
+        note = existing.get(note_id)
+        if note is None:
+            forms.append(None)
+            continue
+        data = {'title': note.title, 'text': note.text, 'slug': note.slug}
+        data.update(item)
+        form = BatchNoteForm(data=data, instance=note)
+        owners[form] = note.slug
+        forms.append(form)
+    return forms, owners
+
+
+def form_result(form):
+    if form is None:
+        return BatchResult(None, {'id': [NOT_FOUND]})
+    if form.errors:
+        return BatchResult(None, {
+            field: list(errors) for field, errors in form.errors.items()
+        })
+    return BatchResult(form.instance, None)
+
+
+def apply_batch(author, create=(), update=(), delete=()):
+    """
+    Применяет пакет изменений заметок автора в одной транзакции.
+
+    Каждый элемент проверяется правилами NoteForm; элементы с ошибками
+    пропускаются, остальные пишутся через bulk_create и bulk_update.
+    Число запросов не зависит от размера пакета. Возвращает словарь
+    со списками BatchResult в порядке элементов запроса.
+    """
+    update_ids, delete_ids = check_batch(create, update, delete)
+    with transaction.atomic():
+        existing = Note.objects.filter(author=author).in_bulk(
+            update_ids + delete_ids
+        )
+        create_forms = [
+            BatchNoteForm(data=item, instance=Note(author=author))
+            for item in create
+        ]
+        update_forms, owners = bind_update_forms(existing, update_ids, update)
+        forms = [
+            form for form in create_forms + update_forms
+            if form is not None and form.is_valid()
+        ]
+        claimed = claim_slugs(forms, owners)
+        forms = [form for form in forms if form.is_valid()]
+        fill_slugs(
+            [form.instance for form in forms if not form.instance.slug],
+            claimed
+        )
+
+        deleted = [existing[note_id] for note_id in delete_ids
+                   if note_id in existing]
+        if deleted:
+            Note.objects.filter(pk__in=[note.pk for note in deleted]).delete()
+        if forms:
+            last = ChangeSequence.allocate(len(forms))
+            for seq, form in enumerate(forms, last - len(forms) + 1):
+                form.instance.seq = seq
+        updated = [form.instance for form in forms if form in owners]
+        Note.objects.bulk_update(updated, ('title', 'text', 'slug', 'seq'))
+        created = [form.instance for form in forms if form not in owners]
+        Note.objects.bulk_create(created)
+        if created:
+            # SQLite не возвращает id из bulk_create: находим их по slug.
+            ids = dict(Note.objects.filter(
+                slug__in=[note.slug for note in created]
+            ).values_list('slug', 'id'))
+            for note in created:
+                note.pk = ids[note.slug]
+
+    # bulk_update и bulk_create обходят Note.save: кеш обновляется здесь.
+    for form in forms:
+        old_slug = owners.get(form)
+        if old_slug and old_slug != form.instance.slug:
+            note_cache.delete(author.pk, old_slug)
+        note_cache.set(form.instance)
+
+    return {
+        'create': [form_result(form) for form in create_forms],
+        'update': [form_result(form) for form in update_forms],
+        'delete': [
+            BatchResult(existing[note_id], None) if note_id in existing
+            else BatchResult(None, {'id': [NOT_FOUND]})
+            for note_id in delete_ids
+        ],
+    }
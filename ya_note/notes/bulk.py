@@ -0,0 +1,25 @@
+import time
+
+
+class Progress:
+    """Пишет в поток число обработанных строк и скорость обработки."""
+
+    def __init__(self, stream, every=100_000):
+        self.stream = stream
+        self.every = every
+        self.count = 0
+        self.started = time.perf_counter()
+        self._next_report = every
+
+    @property
+    def rate(self):
+        return self.count / max(time.perf_counter() - self.started, 1e-9)
+
+    def add(self, count=1):
+        self.count += count
+        if self.count >= self._next_report:
+            self._next_report += self.every
+            self.report()
+
+    def report(self):
+        self.stream.write(f'{self.count} строк, {self.rate:.0f} строк/с')
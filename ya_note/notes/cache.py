@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+NOTE_FIELDS = ('id', 'title', 'text', 'slug', 'author_id')
+
+
+class NoteCache:
+    """
+    Кеш заметок по (author_id, slug) со сквозной записью.
+
+    Перед бэкендом Django стоит локальный уровень в памяти процесса:
+    не больше NOTES_CACHE_LOCAL_SIZE записей с вытеснением давно не
+    читанных. Другие процессы не могут сбросить его записи, поэтому они
+    живут не дольше NOTES_CACHE_LOCAL_TTL секунд.
+    """
+
+    def __init__(self):
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self):
+        return caches[settings.NOTES_CACHE_ALIAS]
+
+    @staticmethod
+    def make_key(author_id, slug):
+        return f'notes:note:{author_id}:{slug}'
+
+    def get(self, author_id, slug):
+        """Данные заметки или None, если её нет ни на одном уровне."""
+        key = self.make_key(author_id, slug)
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._local.move_to_end(key)
+                self.local_hits += 1
+                return entry[1]
+        data = self.backend.get(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.backend_hits += 1
+        self._remember(key, data)
+        return data
+
+    def set(self, note):
+        key = self.make_key(note.author_id, note.slug)
+        data = {field: getattr(note, field) for field in NOTE_FIELDS}
+        self.backend.set(key, data)
+        self._remember(key, data)
+
+    def delete(self, author_id, slug):
+        self.delete_many([(author_id, slug)])
+
+    def delete_many(self, notes):
+        """Удаляет записи по парам (author_id, slug)."""
+        keys = [self.make_key(author_id, slug) for author_id, slug in notes]
+        if not keys:
+            return
+        self.backend.delete_many(keys)
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+
+    def _remember(self, key, data):
+        size = settings.NOTES_CACHE_LOCAL_SIZE
+        if not size:
+            return
+        expires = time.monotonic() + settings.NOTES_CACHE_LOCAL_TTL
+        with self._lock:
+            self._local[key] = (expires, data)
+            self._local.move_to_end(key)
+            while len(self._local) > size:
+                self._local.popitem(last=False)
+
+    def stats(self):
+        """Счётчики попаданий и промахов этого процесса."""
+        with self._lock:
+            return {
+                'local_hits': self.local_hits,
+                'backend_hits': self.backend_hits,
+                'misses': self.misses,
+                'local_size': len(self._local),
+            }
+
+    def clear(self):
+        """Очищает локальный уровень и сбрасывает счётчики."""
+        with self._lock:
+            self._local.clear()
+            self.local_hits = self.backend_hits = self.misses = 0
+
+
+note_cache = NoteCache()
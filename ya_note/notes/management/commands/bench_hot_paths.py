@@ -0,0 +1,90 @@
+import itertools
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from pytils.translit import slugify
+
+from notes.forms import NoteForm
+from notes.models import Note
+from yanote.microbench import compare, load_baseline, measure, save_baseline
+
+BASELINE = settings.BASE_DIR / 'benchmarks' / 'hot_paths.json'
+
+TITLES = [f'Список покупок на неделю номер {number}' for number in range(50)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Микробенчмарки горячих мест заметок: slugify, сохранение '
+        'заметки с подбором slug и проверка формы с явным slug. С --save '
+        'результат становится базовым, с --check замедление больше порога '
+        'относительно базового завершает команду ошибкой. Базовый файл '
+        'записан на одной машине: на другой его стоит перезаписать.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--baseline', default=BASELINE)
+        parser.add_argument('--save', action='store_true')
+        parser.add_argument('--check', action='store_true')
+        parser.add_argument('--threshold', type=float, default=0.25)
+        parser.add_argument('--min-delta', type=float, default=0.05,
+                            help='Меньшие замедления, мс, не в счёт.')
+        parser.add_argument('--notes', type=int, default=10_000,
+                            help='Заметок в базе до замеров.')
+        parser.add_argument('--rounds', type=int, default=15)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            results = {
+                name: measure(case, options['rounds'])
+                for name, case in self.cases(options).items()
+            }
+            transaction.set_rollback(True)
+
+        lines, regressions = compare(
+            results, load_baseline(options['baseline']),
+            options['threshold'], options['min_delta'],
+        )
+        for line in lines:
+            self.stdout.write(line)
+        if options['save']:
+            save_baseline(options['baseline'], results)
+            self.stdout.write(f'Базовые значения: {options["baseline"]}')
+        if options['check'] and regressions:
+            raise CommandError(
+                'Замедлились больше чем на '
+                f'{options["threshold"]:.0%} и {options["min_delta"]} мс: '
+                f'{", ".join(regressions)}'
+            )
+
+    def cases(self, options):
+        author = get_user_model().objects.create(username='bench-hot-paths')
+        Note.objects.bulk_create(
+            Note(
+                title=title, text='Текст', slug=f'{slugify(title)}-{number}',
+                author=author,
+            )
+            for number, title in zip(
+                range(options['notes']), itertools.cycle(TITLES)
+            )
+        )
+        titles = itertools.cycle(TITLES)
+
+        def slugify_title():
+            slugify(TITLES[0])
+
+        def save_with_slug():
+            Note(title=next(titles), text='Текст', author=author).save()
+
+        def clean_explicit_slug():
+            assert NoteForm(data={
+                'title': 'Заметка', 'text': 'Текст', 'slug': 'free-slug',
+            }).is_valid()
+
+        return {
+            'slugify_title': slugify_title,
+            'note_save_auto_slug': save_with_slug,
+            'note_form_clean_slug': clean_explicit_slug,
+        }
@@ -0,0 +1,91 @@
+import itertools
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from notes.models import Note
+from notes.search import search_notes
+
+ALPHABET = 'абвгдежзийклмнопрстуфхцчшщэюя'
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет задержку поиска по заметкам одного пользователя. Данные '
+        'создаются внутри транзакции и откатываются после замеров.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--notes', type=int, default=100_000)
+        parser.add_argument('--other-notes', type=int, default=100_000)
+        parser.add_argument('--queries', type=int, default=500)
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        vocabulary = [
+            ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(3, 10)))
+            for _ in range(30_000)
+        ]
+        # Частоты слов по закону Ципфа, как в естественном тексте.
+        cum_weights = list(itertools.accumulate(
+            1 / rank for rank in range(1, len(vocabulary) + 1)
+        ))
+
+        def sentence(length):
+            return ' '.join(
+                rng.choices(vocabulary, cum_weights=cum_weights, k=length)
+            )
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            User = get_user_model()
+            user = User.objects.create(username='bench-notes-search')
+            other = User.objects.create(username='bench-notes-other')
+            counter = itertools.count()
+            for author, count in (
+                (user, options['notes']), (other, options['other_notes'])
+            ):
+                for start in range(0, count, options['batch_size']):
+                    size = min(options['batch_size'], count - start)
+                    Note.objects.bulk_create(
+                        Note(
+                            title=sentence(rng.randint(2, 6))[:100],
+                            text=sentence(rng.randint(10, 80)),
+                            slug=f'bench-{next(counter)}',
+                            author=author,
+                        )
+                        for _ in range(size)
+                    )
+            self.stdout.write(
+                f'Заметок: {options["notes"]} у пользователя и '
+                f'{options["other_notes"]} у другого, созданы за '
+                f'{time.perf_counter() - started:.1f} с'
+            )
+
+            frequent_words = vocabulary[:3000]
+            timings = []
+            for _ in range(options['queries']):
+                query = ' '.join(
+                    word[:rng.randint(2, len(word))]
+                    for word in rng.choices(
+                        frequent_words, k=rng.randint(1, 2)
+                    )
+                )
+                started = time.perf_counter()
+                search_notes(user, query, options['limit'])
+                timings.append((time.perf_counter() - started) * 1000)
+            transaction.set_rollback(True)
+
+        percentiles = statistics.quantiles(timings, n=100)
+        self.stdout.write(
+            f'Запросов: {len(timings)}; p50 {percentiles[49]:.2f} мс, '
+            f'p95 {percentiles[94]:.2f} мс, p99 {percentiles[98]:.2f} мс, '
+            f'max {max(timings):.2f} мс'
+        )
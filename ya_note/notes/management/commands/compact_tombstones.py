@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from notes.sync import compact_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет старые надгробия удалённых заметок. Клиентам, которые '
+        'не синхронизировались дольше срока, придётся выгрузить всё заново.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.NOTES_TOMBSTONE_DAYS
+        )
+
+    def handle(self, *args, **options):
+        deleted = compact_tombstones(
+            timezone.now() - timedelta(days=options['days'])
+        )
+        self.stdout.write(f'Удалено надгробий: {deleted}')
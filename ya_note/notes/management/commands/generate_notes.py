@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from notes.bulk import Progress
+from notes.synthetic import generate
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими пользователями и заметками для '
+        'проверки масштабирования. Число заметок у авторов распределено '
+        'по закону Ципфа, результат определяется --seed. Строки '
+        'дописываются к существующим.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10_000)
+        parser.add_argument('--notes', type=int, default=1_000_000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--skew', type=float, default=1.0,
+                            help='Показатель распределения Ципфа.')
+        parser.add_argument('--batch-size', type=int, default=10_000,
+                            help='Строк в одной транзакции.')
+
+    def handle(self, *args, **options):
+        progress = Progress(self.stderr)
+        generated = generate(
+            options['users'], options['notes'], seed=options['seed'],
+            skew=options['skew'], batch_size=options['batch_size'],
+            on_batch=progress.add,
+        )
+        progress.report()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пользователей: {len(generated.users)}, '
+            f'заметок: {generated.notes}'
+        ))
@@ -0,0 +1,53 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from yanote.instrumentation import merge_stats, new_stats, percentile
+
+
+class Command(BaseCommand):
+    help = (
+        'Сводит статистику запросов, которую процессы сбрасывают в '
+        'PERF_STATS_DIR: перцентили времени ответа и средние числа '
+        'запросов, время SQL и шаблонов, размер ответа по имени URL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--minutes', type=float,
+            help='Только окна, начатые за последние N минут.'
+        )
+
+    def handle(self, *args, **options):
+        since = options['minutes'] and time.time() - options['minutes'] * 60
+        totals = {}
+        for path in sorted(settings.PERF_STATS_DIR.glob('*.json')):
+            for window in json.loads(path.read_text())['windows']:
+                if since and window['started'] < since:
+                    continue
+                for view, stats in window['views'].items():
+                    merge_stats(totals.setdefault(view, new_stats()), stats)
+        if not totals:
+            self.stdout.write('Статистики пока нет.')
+            return
+        self.stdout.write(
+            f'{"view":<28}{"count":>8}{"p50":>9}{"p95":>9}{"p99":>9}'
+            f'{"max":>9}{"queries":>9}{"sql":>8}{"render":>8}{"KiB":>8}'
+        )
+        for view, stats in sorted(
+            totals.items(), key=lambda item: -item[1]['wall_ms']
+        ):
+            count = stats['count']
+            self.stdout.write(
+                f'{view:<28}{count:>8}'
+                f'{percentile(stats, 0.5):>9.1f}'
+                f'{percentile(stats, 0.95):>9.1f}'
+                f'{percentile(stats, 0.99):>9.1f}'
+                f'{stats["max_ms"]:>9.1f}'
+                f'{stats["queries"] / count:>9.1f}'
+                f'{stats["sql_ms"] / count:>8.1f}'
+                f'{stats["render_ms"] / count:>8.1f}'
+                f'{stats["bytes"] / count / 1024:>8.1f}'
+            )
@@ -0,0 +1,60 @@
+from django.db import migrations
+
+# Индекс внешнего содержимого: тексты хранятся только в notes_note,
+# а author_id индексируется как слово, чтобы поиск по заметкам одного
+# пользователя отсекал чужие заметки прямо в индексе.
+CREATE_INDEX = (
+    """
+    CREATE VIRTUAL TABLE notes_search USING fts5(
+        title,
+        text,
+        author_id,
+        content = 'notes_note',
+        content_rowid = 'id',
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER notes_search_insert AFTER INSERT ON notes_note
+    BEGIN
+        INSERT INTO notes_search (rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END
+    """,
+    """
+    CREATE TRIGGER notes_search_update
+    AFTER UPDATE OF title, text, author_id ON notes_note
+    BEGIN
+        INSERT INTO notes_search (notes_search, rowid, title, text, author_id)
+        VALUES ('delete', old.id, old.title, old.text, old.author_id);
+        INSERT INTO notes_search (rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END
+    """,
+    """
+    CREATE TRIGGER notes_search_delete AFTER DELETE ON notes_note
+    BEGIN
+        INSERT INTO notes_search (notes_search, rowid, title, text, author_id)
+        VALUES ('delete', old.id, old.title, old.text, old.author_id);
+    END
+    """,
+    "INSERT INTO notes_search (notes_search) VALUES ('rebuild')",
+)
+
+DROP_INDEX = (
+    'DROP TRIGGER notes_search_delete',
+    'DROP TRIGGER notes_search_update',
+    'DROP TRIGGER notes_search_insert',
+    'DROP TABLE notes_search',
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0002_note_author_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_INDEX, DROP_INDEX),
+    ]
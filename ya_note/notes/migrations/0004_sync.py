@@ -0,0 +1,76 @@
+# Generated by Django 3.2.15 on 2026-10-18 17:36
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import F, Max
+
+
+def number_existing_notes(apps, schema_editor):
+    Note = apps.get_model('notes', 'Note')
+    ChangeSequence = apps.get_model('notes', 'ChangeSequence')
+    Note.objects.update(seq=F('id'))
+    ChangeSequence.objects.create(
+        pk=1, value=Note.objects.aggregate(last=Max('id'))['last'] or 0
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('notes', '0003_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.PositiveBigIntegerField(default=0)),
+                ('horizon', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='NoteTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('note_id', models.PositiveBigIntegerField()),
+                ('seq', models.PositiveBigIntegerField()),
+                ('deleted', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        # На SQLite AddField пересоздаёт notes_note и теряет триггеры
+        # поискового индекса, поэтому столбец добавляется через ALTER TABLE.
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'ALTER TABLE notes_note ADD COLUMN "seq" bigint unsigned '
+                    'NOT NULL DEFAULT 0 CHECK ("seq" >= 0)',
+                    # Индекс по seq при откате удаляется раньше столбца.
+                    'ALTER TABLE notes_note DROP COLUMN "seq"',
+                ),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name='note',
+                    name='seq',
+                    field=models.PositiveBigIntegerField(default=0, editable=False, verbose_name='Номер изменения'),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['author', 'seq'], name='note_author_seq_idx'),
+        ),
+        migrations.AddField(
+            model_name='notetombstone',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='notetombstone',
+            index=models.Index(fields=['author', 'seq'], name='tombstone_author_seq_idx'),
+        ),
+        migrations.RunPython(number_existing_notes, migrations.RunPython.noop),
+    ]
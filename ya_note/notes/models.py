@@ -1,7 +1,65 @@
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models, router, transaction
+from django.db.models import F
 
-from pytils.translit import slugify
+from .cache import note_cache
+from .slugs import allocate_slug
+
+# Сколько раз подбирать новый slug, если его успели занять.
+SLUG_ATTEMPTS = 5
+
+
+class ChangeSequence(models.Model):
+    """
+    Счётчик номеров изменений заметок — единственная строка.
+
+    Номер выдаётся в той же транзакции, что и запись заметки, а строка
+    счётчика заблокирована до её конца, поэтому номера растут в порядке
+    фиксации транзакций. horizon — наибольший номер удалённых
+    надгробий: клиентам, синхронизированным раньше, нужна полная выгрузка.
+    """
+    value = models.PositiveBigIntegerField(default=0)
+    horizon = models.PositiveBigIntegerField(default=0)
+
+    @classmethod
+    def allocate(cls, count=1, using=None):
+        """Выделяет count номеров подряд и возвращает последний из них."""
+        sequences = cls.objects.using(using)
+        with transaction.atomic(using=using, savepoint=False):
+            if not sequences.filter(pk=1).update(value=F('value') + count):
+                sequences.get_or_create(pk=1)
+                sequences.filter(pk=1).update(value=F('value') + count)
+            return sequences.values_list('value', flat=True).get(pk=1)
+
+
+class NoteQuerySet(models.QuerySet):
+
+    def delete(self):
+        """
+        Удаляет заметки, оставляя надгробия для синхронизации.
+
+        Записи удалённых заметок убираются из кеша.
+        """
+        with transaction.atomic(using=self.db):
+            notes = list(self.values_list('id', 'author_id', 'slug'))
+            if notes:
+                last = ChangeSequence.allocate(len(notes), using=self.db)
+                NoteTombstone.objects.using(self.db).bulk_create(
+                    NoteTombstone(
+                        note_id=note_id, author_id=author_id, seq=seq
+                    )
+                    for (note_id, author_id, _), seq in zip(
+                        notes, range(last - len(notes) + 1, last + 1)
+                    )
+                )
+            deleted = super().delete()
+        note_cache.delete_many(
+            (author_id, slug) for _, author_id, slug in notes
+        )
+        return deleted
+
+    delete.alters_data = True
+    delete.queryset_only = True
 
 
 class Note(models.Model):
@@ -27,12 +85,105 @@ class Note(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
+    seq = models.PositiveBigIntegerField(
+        'Номер изменения', default=0, editable=False
+    )
+
+    objects = NoteQuerySet.as_manager()
+
+    class Meta:
+        indexes = (
+            models.Index(fields=('author', 'id'), name='note_author_id_idx'),
+            models.Index(fields=('author', 'seq'), name='note_author_seq_idx'),
+        )
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        note = super().from_db(db, field_names, values)
+        # Ключ кеша прочитанной заметки: если save сменит slug или
+        # автора, запись под прежним ключом нужно убрать.
+        loaded = dict(zip(field_names, values))
+        if 'author_id' in loaded and 'slug' in loaded:
+            note._cache_key = (loaded['author_id'], loaded['slug'])
+        return note
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            max_slug_length = self._meta.get_field('slug').max_length
-            self.slug = slugify(self.title)[:max_slug_length]
-        super().save(*args, **kwargs)
+        """
+        Записывает заметку с новым номером изменения и кладёт в кеш.
+
+        Без явного slug подбирает свободный по заголовку. Подбор и запись
+        идут в одной транзакции. Если slug всё же успел занять
+        параллельный запрос, подбор повторяется.
+        """
+        self._save(*args, **kwargs)
+        previous = getattr(self, '_cache_key', None)
+        self._cache_key = (self.author_id, self.slug)
+        if previous not in (None, self._cache_key):
+            note_cache.delete(*previous)
+        note_cache.set(self)
+
+    def _save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(
+            Note, instance=self
+        )
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'seq'}
+        if self.slug:
+            with transaction.atomic(using=using):
+                self.seq = ChangeSequence.allocate(using=using)
+                return super().save(*args, **kwargs)
+        max_slug_length = self._meta.get_field('slug').max_length
+        notes = Note.objects.using(using)
+        if self.pk is not None:
+            # Своё прежнее значение slug заметка может оставить себе.
+            notes = notes.exclude(pk=self.pk)
+        for attempt in range(SLUG_ATTEMPTS):
+            try:
+                with transaction.atomic(using=using):
+                    self.seq = ChangeSequence.allocate(using=using)
+                    self.slug = allocate_slug(
+                        notes, self.title, max_slug_length
+                    )
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                slug_taken = notes.filter(slug=self.slug).exists()
+                self.slug = ''
+                if not slug_taken or attempt == SLUG_ATTEMPTS - 1:
+                    raise
+
+    def delete(self, using=None, keep_parents=False):
+        """Удаляет заметку с надгробием для синхронизации и из кеша."""
+        using = using or router.db_for_write(Note, instance=self)
+        with transaction.atomic(using=using):
+            NoteTombstone.objects.using(using).create(
+                note_id=self.pk,
+                author_id=self.author_id,
+                seq=ChangeSequence.allocate(using=using),
+            )
+            deleted = super().delete(using, keep_parents)
+        note_cache.delete_many({
+            getattr(self, '_cache_key', None) or (self.author_id, self.slug),
+            (self.author_id, self.slug),
+        })
+        return deleted
+
+
+class NoteTombstone(models.Model):
+    """След удалённой заметки: по нему клиенты узнают об удалении."""
+    note_id = models.PositiveBigIntegerField()
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+    )
+    seq = models.PositiveBigIntegerField()
+    deleted = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('author', 'seq'), name='tombstone_author_seq_idx'
+            ),
+        )
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.http import Http404
+
+
+def get_notes_page(notes, after=None, limit=None):
+    """
+    Возвращает страницу заметок после курсора и курсор следующей.
+
+    Курсор — id последней показанной заметки. Страница выбирается
+    по индексу (author, id), поэтому её стоимость не зависит от того,
+    сколько заметок у пользователя и насколько страница далеко.
+    """
+    limit = limit or settings.NOTES_PER_PAGE
+    notes = notes.order_by('id')
+    if after:
+        try:
+            notes = notes.filter(id__gt=int(after))
+        except ValueError:
+            raise Http404('Некорректный курсор.')
+    notes = list(notes[:limit + 1])
+    next_cursor = None
+    if len(notes) > limit:
+        notes = notes[:limit]
+        last = notes[-1]
+        next_cursor = last['id'] if isinstance(last, dict) else last.id
+    return notes, next_cursor
@@ -0,0 +1,69 @@
+import re
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+SearchResult = namedtuple('SearchResult', ('id', 'title', 'slug', 'snippet'))
+
+# Маркеры подсветки, которых не бывает в пользовательском тексте:
+# сниппет сначала экранируется, и только потом они меняются на <mark>.
+MARK_START, MARK_END = '\x02', '\x03'
+
+# Совпадение в заголовке весит больше, чем в тексте; author_id
+# служит только фильтром и в ранжировании не участвует.
+SEARCH_SQL = f"""
+    SELECT
+        notes_note.id,
+        notes_note.title,
+        notes_note.slug,
+        snippet(notes_search, 1, '{MARK_START}', '{MARK_END}', '…', 16)
+    FROM notes_search
+    JOIN notes_note ON notes_note.id = notes_search.rowid
+    WHERE notes_search MATCH %s
+    ORDER BY bm25(notes_search, 10.0, 1.0, 0.0)
+    LIMIT %s
+"""
+
+
+def build_query(author_id, text):
+    """
+    Запрос FTS5: все слова по префиксу в заголовке или тексте автора.
+
+    Кавычки и операторы FTS5 из ввода отбрасываются.
+    """
+    terms = ' '.join(f'"{term}"*' for term in re.findall(r'\w+', text))
+    if not terms:
+        return None
+    return f'author_id:"{int(author_id)}" AND {{title text}}: ({terms})'
+
+
+def parse_limit(value):
+    """Число результатов из параметра запроса; без него — по умолчанию."""
+    try:
+        return max(int(value), 1)
+    except (TypeError, ValueError):
+        return None
+
+
+def search_notes(author, text, limit=None):
+    """Заметки автора, подходящие под запрос, начиная с лучших."""
+    query = build_query(author.pk, text)
+    if query is None:
+        return []
+    limit = min(
+        limit or settings.NOTES_SEARCH_LIMIT, settings.NOTES_SEARCH_LIMIT
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(SEARCH_SQL, (query, limit))
+        rows = cursor.fetchall()
+    return [
+        SearchResult(note_id, title, slug, mark_safe(
+            escape(snippet).replace(MARK_START, '<mark>').replace(
+                MARK_END, '</mark>'
+            )
+        ))
+        for note_id, title, slug, snippet in rows
+    ]
@@ -0,0 +1,56 @@
+import re
+
+from django.db.models import Q
+from pytils.translit import slugify
+
+# Сколько символов оставить под суффикс вида -N у длинных slug.
+SUFFIX_RESERVE = 8
+DEFAULT_SLUG = 'note'
+
+
+def slug_stem(base, max_length):
+    """Часть slug, к которой добавляется суффикс -N."""
+    if len(base) <= max_length - SUFFIX_RESERVE:
+        return base
+    return base[:max_length - SUFFIX_RESERVE]
+
+
+def taken_slugs(queryset, bases, max_length):
+    """
+    Занятые slug вида base и stem-N для всех base одним запросом.
+
+    Условия — диапазоны по уникальному индексу slug: '-' и '.' соседние
+    символы, поэтому stem- <= slug < stem. задаёт все stem-<что угодно>.
+    """
+    query = Q()
+    for base in bases:
+        stem = slug_stem(base, max_length)
+        query |= Q(slug=base) | Q(slug__gt=f'{stem}-', slug__lt=f'{stem}.')
+    if not query:
+        return set()
+    return set(queryset.filter(query).values_list('slug', flat=True))
+
+
+def next_free_slug(base, taken, max_length):
+    """Возвращает base или stem-N с наибольшим N среди занятых плюс один."""
+    if base not in taken:
+        return base
+    stem = slug_stem(base, max_length)
+    suffix = re.compile(rf'^{re.escape(stem)}-(\d+)$')
+    numbers = [
+        int(match.group(1))
+        for match in map(suffix.match, taken) if match
+    ]
+    return f'{stem}-{max(numbers, default=1) + 1}'
+
+
+def make_slug_base(title, max_length):
+    return slugify(title)[:max_length] or DEFAULT_SLUG
+
+
+def allocate_slug(queryset, title, max_length):
+    """Свободный slug для заголовка за один запрос к базе."""
+    base = make_slug_base(title, max_length)
+    return next_free_slug(
+        base, taken_slugs(queryset, (base,), max_length), max_length
+    )
@@ -0,0 +1,92 @@
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.http import Http404
+
+from .models import ChangeSequence, Note, NoteTombstone
+
+SYNC_FIELDS = ('id', 'title', 'text', 'slug', 'seq')
+
+Changes = namedtuple('Changes', ('notes', 'deleted', 'seq', 'more'))
+
+
+class SyncReset(Exception):
+    """Изменения после since восстановить нельзя: нужна выгрузка с нуля."""
+
+
+def parse_since(value):
+    """Номер изменения из параметра запроса; без него — с начала."""
+    if not value:
+        return 0
+    try:
+        since = int(value)
+    except ValueError:
+        raise Http404('Некорректный номер изменения.')
+    if since < 0:
+        raise Http404('Некорректный номер изменения.')
+    return since
+
+
+def get_changes(author, since=0, limit=None):
+    """
+    Заметки автора, изменённые после since, и id удалённых.
+
+    Обе выборки идут по индексам (author, seq), поэтому работа зависит
+    от числа изменений, а не от числа заметок. Верхняя граница —
+    значение счётчика до выборок: номера фиксируются по порядку, так
+    что всё до неё уже видно и курсор не перескочит незафиксированное.
+    """
+    limit = limit or settings.NOTES_SYNC_LIMIT
+    # Строки счётчика нет, пока не было ни одной записи: изменений нет.
+    horizon, upper = ChangeSequence.objects.values_list(
+        'horizon', 'value'
+    ).filter(pk=1).first() or (0, 0)
+    if since > upper or 0 < since < horizon:
+        raise SyncReset
+    notes = list(
+        Note.objects.filter(
+            author=author, seq__gt=since, seq__lte=upper
+        ).order_by('seq').values(*SYNC_FIELDS)[:limit + 1]
+    )
+    # Клиенту без данных удаления не нужны.
+    tombstones = list(
+        NoteTombstone.objects.filter(
+            author=author, seq__gt=since, seq__lte=upper
+        ).order_by('seq').values_list('seq', 'note_id')[:limit + 1]
+    ) if since else []
+    changes = sorted(
+        [(note['seq'], note) for note in notes] + tombstones,
+        key=lambda change: change[0],
+    )
+    more = len(changes) > limit
+    changes = changes[:limit]
+    return Changes(
+        notes=[change for _, change in changes if isinstance(change, dict)],
+        deleted=[
+            change for _, change in changes if not isinstance(change, dict)
+        ],
+        seq=changes[-1][0] if more else upper,
+        more=more,
+    )
+
+
+def compact_tombstones(before):
+    """
+    Удаляет надгробия старше before и сдвигает горизонт.
+
+    Клиенты, синхронизированные до горизонта, получат SyncReset.
+    Возвращает число удалённых надгробий.
+    """
+    with transaction.atomic():
+        horizon = NoteTombstone.objects.filter(
+            deleted__lt=before
+        ).aggregate(horizon=Max('seq'))['horizon']
+        if horizon is None:
+            return 0
+        ChangeSequence.objects.filter(
+            pk=1, horizon__lt=horizon
+        ).update(horizon=horizon)
+        deleted, _ = NoteTombstone.objects.filter(seq__lte=horizon).delete()
+    return deleted
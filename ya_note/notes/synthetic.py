@@ -0,0 +1,131 @@
+"""
+Синтетические пользователи и заметки для проверки масштабирования.
+
+Всё определяется зерном генератора: при том же зерне и той же пустой
+базе получаются те же строки. id назначаются заранее, начиная после
+наибольшего существующего, поэтому slug и связи собираются без чтения
+из базы, а строки пишутся пачками по мере генерации.
+"""
+import itertools
+import random
+from collections import namedtuple
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Max
+
+from .models import ChangeSequence, Note
+from .slugs import make_slug_base, slug_stem
+
+WORDS = (
+    'список', 'покупок', 'идеи', 'для', 'отпуска', 'рецепт', 'пирога',
+    'встреча', 'с', 'друзьями', 'планы', 'на', 'неделю', 'книги',
+    'прочитать', 'ремонт', 'кухни', 'тренировка', 'конспект', 'лекции',
+    'подарки', 'к', 'празднику', 'дела', 'по', 'дому', 'заметки', 'о',
+    'поездке', 'фильмы',
+)
+
+# Пароль, с которым нельзя войти: как у set_unusable_password().
+UNUSABLE_PASSWORD = '!'
+
+Generated = namedtuple('Generated', 'users notes')
+
+
+def skewed_counts(total, buckets, rng, skew=1.0):
+    """
+    Раскладывает total по buckets по закону Ципфа.
+
+    Доля корзины ранга r пропорциональна 1 / r ** skew, ранги
+    перемешаны, сумма счётчиков ровно total.
+    """
+    if not buckets:
+        return []
+    weights = [1 / rank ** skew for rank in range(1, buckets + 1)]
+    rng.shuffle(weights)
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    for index in rng.sample(range(buckets), total - sum(counts)):
+        counts[index] += 1
+    return counts
+
+
+def phrase(rng, words, max_length):
+    text = ' '.join(rng.choices(WORDS, k=words))
+    return text[:max_length].capitalize()
+
+
+def next_pk(model, using):
+    last = model.objects.using(using).aggregate(last=Max('pk'))['last']
+    return (last or 0) + 1
+
+
+def batches(objs, size):
+    objs = iter(objs)
+    while True:
+        batch = list(itertools.islice(objs, size))
+        if not batch:
+            return
+        yield batch
+
+
+def generate_users(count, batch_size, using, on_batch=None):
+    User = get_user_model()
+    first = next_pk(User, using)
+    pks = range(first, first + count)
+    users = (
+        User(pk=pk, username=f'synthetic-{pk}', password=UNUSABLE_PASSWORD)
+        for pk in pks
+    )
+    for batch in batches(users, batch_size):
+        with transaction.atomic(using=using):
+            User.objects.using(using).bulk_create(batch)
+        if on_batch is not None:
+            on_batch(len(batch))
+    return pks
+
+
+def build_notes(rng, first, counts, author_pks):
+    """
+    Заметки авторов по порядку.
+
+    slug — slugify заголовка с id заметки в суффиксе: он уникален без
+    проверки по базе и имеет тот же вид stem-N, что подбирает сайт.
+    """
+    title_length = Note._meta.get_field('title').max_length
+    slug_length = Note._meta.get_field('slug').max_length
+    pks = itertools.count(first)
+    for author_pk, count in zip(author_pks, counts):
+        for pk in itertools.islice(pks, count):
+            title = phrase(rng, rng.randint(2, 6), title_length)
+            stem = slug_stem(make_slug_base(title, slug_length), slug_length)
+            yield Note(
+                pk=pk,
+                title=title,
+                text=phrase(rng, rng.randint(10, 60), 2000),
+                slug=f'{stem}-{pk}',
+                author_id=author_pk,
+            )
+
+
+def generate(users, notes, seed=0, skew=1.0, batch_size=10_000,
+             using='default', on_batch=None):
+    """
+    Создаёт пользователей и их заметки.
+
+    Заметки раскладываются по авторам неравномерно (см. skewed_counts).
+    Номера изменений выделяются на пачку целиком, как при записи через
+    сайт. on_batch вызывается с числом строк после каждой пачки.
+    """
+    rng = random.Random(seed)
+    author_pks = generate_users(users, batch_size, using, on_batch)
+    counts = skewed_counts(notes if users else 0, users, rng, skew)
+    objs = build_notes(rng, next_pk(Note, using), counts, author_pks)
+    for batch in batches(objs, batch_size):
+        with transaction.atomic(using=using):
+            last = ChangeSequence.allocate(len(batch), using=using)
+            for seq, note in enumerate(batch, last - len(batch) + 1):
+                note.seq = seq
+            Note.objects.using(using).bulk_create(batch)
+        if on_batch is not None:
+            on_batch(len(batch))
+    return Generated(author_pks, sum(counts))
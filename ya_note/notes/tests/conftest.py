@@ -0,0 +1,10 @@
+import pytest
+
+from django.test import override_settings
+
+
+@pytest.fixture(autouse=True)
+def raise_on_n_plus_one():
+    """Повторяющиеся SQL-запросы в запросе к сайту валят тест."""
+    with override_settings(NPLUSONE_RAISE=True):
+        yield
@@ -0,0 +1,75 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from notes.models import Note
+
+User = get_user_model()
+
+FULL_SCAN = re.compile(r'^SCAN (TABLE )?notes_note\b')
+
+
+class TestNoteAdmin(TestCase):
+    CHANGELIST = reverse('admin:notes_note_changelist')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', password='admin')
+        cls.note = Note.objects.create(
+            title='Заметка', text='Текст', slug='note', author=cls.admin
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def add_notes(self, count):
+        for number in range(count):
+            Note.objects.create(
+                title=f'Заметка {number}', text='Текст',
+                author=User.objects.create(username=f'author-{number}'),
+            )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url)
+        return len(context.captured_queries)
+
+    def test_changelist_queries_do_not_depend_on_rows(self):
+        self.client.get(self.CHANGELIST)
+        few = self.count_queries(self.CHANGELIST)
+        self.add_notes(10)
+        self.assertEqual(self.count_queries(self.CHANGELIST), few)
+
+    def test_change_page_does_not_list_users(self):
+        self.add_notes(5)
+        response = self.client.get(
+            reverse('admin:notes_note_change', args=(self.note.pk,))
+        )
+        self.assertContains(response, 'vForeignKeyRawIdAdminField')
+        self.assertNotContains(response, '<option')
+
+    def test_search_matches_exact_slug(self):
+        self.add_notes(3)
+        response = self.client.get(self.CHANGELIST, {'q': 'note'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.note])
+
+    def test_search_uses_slug_index(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.CHANGELIST, {'q': 'note'})
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "notes_note"' in query['sql'] and 'slug' in query['sql']
+            and 'WHERE' in query['sql']
+        ]
+        self.assertTrue(queries)
+        for sql in queries:
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plan = [row[-1] for row in cursor.fetchall()]
+            self.assertFalse(
+                any(FULL_SCAN.match(step) for step in plan), (sql, plan)
+            )
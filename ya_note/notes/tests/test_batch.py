@@ -0,0 +1,129 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from notes.cache import note_cache
+from notes.forms import WARNING
+from notes.models import Note
+
+User = get_user_model()
+
+
+class TestNotesBatch(TestCase):
+    URL = reverse('notes:api_batch')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.reader = User.objects.create(username='Читатель')
+        cls.note = Note.objects.create(
+            title='Старая', text='Текст', slug='old', author=cls.author
+        )
+        cls.foreign = Note.objects.create(
+            title='Чужая', text='Текст', slug='foreign', author=cls.reader
+        )
+
+    def setUp(self):
+        cache.clear()
+        note_cache.clear()
+        self.client.force_login(self.author)
+
+    def post(self, payload):
+        return self.client.post(
+            self.URL, payload, content_type='application/json'
+        )
+
+    def test_query_count_does_not_grow_with_batch(self):
+        def batch(size, prefix):
+            return {'create': [
+                {'title': 'Заметка', 'text': 'Текст'} for _ in range(size)
+            ] + [
+                {'title': 'С адресом', 'text': 'Текст', 'slug': f'{prefix}{i}'}
+                for i in range(size)
+            ]}
+
+        with self.assertNumQueries(10):
+            self.post(batch(1, 'a'))
+        with self.assertNumQueries(10):
+            response = self.post(batch(50, 'b'))
+        created = [item['note'] for item in response.json()['create']]
+        self.assertEqual(len(created), 100)
+        self.assertEqual(created[0]['slug'], 'zametka-2')
+        self.assertEqual(created[49]['slug'], 'zametka-51')
+        self.assertEqual(
+            {note['id'] for note in created},
+            set(Note.objects.filter(
+                slug__in=[note['slug'] for note in created]
+            ).values_list('id', flat=True))
+        )
+
+    def test_create_update_delete(self):
+        doomed = Note.objects.create(
+            title='Удалить', text='Текст', author=self.author
+        )
+        response = self.post({
+            'create': [{'title': 'Новая', 'text': 'Текст', 'slug': 'new'}],
+            'update': [{'id': self.note.id, 'slug': 'renamed'}],
+            'delete': [doomed.id],
+        })
+        self.assertEqual(response.status_code, 200)
+        results = response.json()
+        self.assertTrue(all(
+            item['ok'] for items in results.values() for item in items
+        ))
+        self.note.refresh_from_db()
+        self.assertEqual(
+            (self.note.title, self.note.slug), ('Старая', 'renamed')
+        )
+        self.assertFalse(Note.objects.filter(id=doomed.id).exists())
+        self.assertTrue(Note.objects.filter(slug='new').exists())
+
+    def test_per_item_errors(self):
+        response = self.post({
+            'create': [
+                {'title': 'Первая', 'text': 'Текст', 'slug': 'same'},
+                {'title': 'Вторая', 'text': 'Текст', 'slug': 'same'},
+                {'title': 'Занятый', 'text': 'Текст', 'slug': 'foreign'},
+                {'title': 'Без текста'},
+            ],
+            'update': [{'id': self.foreign.id, 'title': 'Взлом'}],
+            'delete': [self.foreign.id + 1000],
+        })
+        results = response.json()
+        self.assertEqual(
+            [item['ok'] for item in results['create']],
+            [True, False, False, False]
+        )
+        self.assertEqual(
+            results['create'][1]['errors'], {'slug': ['same' + WARNING]}
+        )
+        self.assertIn('text', results['create'][3]['errors'])
+        self.assertFalse(results['update'][0]['ok'])
+        self.assertFalse(results['delete'][0]['ok'])
+        self.foreign.refresh_from_db()
+        self.assertEqual(self.foreign.title, 'Чужая')
+        self.assertEqual(Note.objects.filter(slug='same').count(), 1)
+
+    def test_rename_keeps_detail_cache_coherent(self):
+        detail = reverse('notes:detail', args=(self.note.slug,))
+        self.client.get(detail)
+        self.post({'update': [{'id': self.note.id, 'slug': 'renamed'}]})
+        self.assertEqual(self.client.get(detail).status_code, 404)
+        response = self.client.get(reverse('notes:detail', args=('renamed',)))
+        self.assertEqual(response.status_code, 200)
+
+    def test_bad_payload(self):
+        for payload in (
+            [], {'create': {}}, {'update': [1]},
+            {'update': [{'id': self.note.id}], 'delete': [self.note.id]},
+        ):
+            with self.subTest(payload=payload):
+                self.assertEqual(self.post(payload).status_code, 400)
+        with self.settings(NOTES_BATCH_LIMIT=1):
+            response = self.post({'delete': [1, 2]})
+        self.assertEqual(response.status_code, 400)
+
+    def test_anonymous_forbidden(self):
+        self.client.logout()
+        self.assertEqual(self.post({}).status_code, 403)
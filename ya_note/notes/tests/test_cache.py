@@ -0,0 +1,109 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from notes.cache import note_cache
+from notes.models import Note
+
+User = get_user_model()
+
+
+class TestNoteCache(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.reader = User.objects.create(username='Читатель')
+        cls.note = Note.objects.create(
+            title='Заголовок', text='Текст', slug='note-slug',
+            author=cls.author
+        )
+
+    def setUp(self):
+        cache.clear()
+        note_cache.clear()
+        self.client.force_login(self.author)
+
+    def detail(self, slug='note-slug'):
+        return self.client.get(reverse('notes:detail', args=(slug,)))
+
+    def test_second_read_skips_database(self):
+        self.detail()
+        with self.assertNumQueries(2):
+            response = self.detail()
+        self.assertEqual(response.context['note'].title, self.note.title)
+        self.assertEqual(note_cache.stats()['local_hits'], 1)
+
+    @override_settings(NOTES_CACHE_LOCAL_SIZE=0)
+    def test_backend_tier(self):
+        self.detail()
+        self.detail()
+        stats = note_cache.stats()
+        self.assertEqual((stats['misses'], stats['backend_hits']), (1, 1))
+
+    @override_settings(NOTES_CACHE_LOCAL_SIZE=1)
+    def test_local_tier_is_bounded(self):
+        other = Note.objects.create(
+            title='Другая', text='Текст', slug='other', author=self.author
+        )
+        self.detail()
+        self.detail(other.slug)
+        self.assertEqual(note_cache.stats()['local_size'], 1)
+
+    def test_update_writes_through(self):
+        self.detail()
+        self.client.post(
+            reverse('notes:edit', args=(self.note.slug,)),
+            {'title': 'Новый', 'text': 'Текст', 'slug': 'new-slug'}
+        )
+        self.assertEqual(self.detail().status_code, 404)
+        with self.assertNumQueries(2):
+            response = self.detail('new-slug')
+        self.assertEqual(response.context['note'].title, 'Новый')
+
+    def test_delete_evicts(self):
+        self.detail()
+        self.client.post(reverse('notes:delete', args=(self.note.slug,)))
+        self.assertEqual(self.detail().status_code, 404)
+
+    def test_writes_outside_views_update_cache(self):
+        self.detail()
+        note = Note.objects.get(pk=self.note.pk)
+        note.title = 'Из консоли'
+        note.slug = 'shell-slug'
+        note.save()
+        self.assertEqual(self.detail().status_code, 404)
+        self.assertEqual(
+            self.detail('shell-slug').context['note'].title, 'Из консоли'
+        )
+
+    def test_note_deleted_outside_views_is_gone(self):
+        admin = User.objects.create_superuser('admin', password='admin')
+        deletions = (
+            lambda note: self.admin_delete(admin, note),
+            lambda note: Note.objects.get(pk=note.pk).delete(),
+            lambda note: Note.objects.filter(pk=note.pk).delete(),
+        )
+        for number, delete in enumerate(deletions):
+            with self.subTest(number=number):
+                note = Note.objects.create(
+                    title='Заметка', text='Текст', slug=f'gone-{number}',
+                    author=self.author,
+                )
+                self.assertEqual(self.detail(note.slug).status_code, 200)
+                delete(note)
+                self.client.force_login(self.author)
+                self.assertEqual(self.detail(note.slug).status_code, 404)
+
+    def admin_delete(self, admin, note):
+        self.client.force_login(admin)
+        self.client.post(
+            reverse('admin:notes_note_delete', args=(note.pk,)),
+            {'post': 'yes'},
+        )
+
+    def test_other_user_misses(self):
+        self.detail()
+        self.client.force_login(self.reader)
+        self.assertEqual(self.detail().status_code, 404)
@@ -1,5 +1,7 @@
+from http import HTTPStatus
+
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
 from notes.models import Note
@@ -48,3 +50,64 @@ class TestRoures(TestCase):
                 url = reverse(name, args=args)
                 response = author_client.get(url)
                 self.assertIn('form', response.context)
+
+
+@override_settings(NOTES_PER_PAGE=2)
+class TestNotesPagination(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.notes = [
+            Note.objects.create(
+                title=f'Заметка {index}', text='Текст', author=cls.author
+            )
+            for index in range(5)
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    def test_list_pages_follow_cursor(self):
+        url = reverse('notes:list')
+        pages = []
+        params = {}
+        while True:
+            response = self.client.get(url, params)
+            pages.append(list(response.context['object_list']))
+            if not response.context['next_cursor']:
+                break
+            params = {'after': response.context['next_cursor']}
+        self.assertEqual(
+            pages, [self.notes[:2], self.notes[2:4], self.notes[4:]]
+        )
+
+    def test_list_page_is_one_query(self):
+        # Session, user and a single query for the page of notes.
+        with self.assertNumQueries(3):
+            self.client.get(reverse('notes:list'))
+
+    def test_api_list_returns_next_cursor(self):
+        url = reverse('notes:api_list')
+        response = self.client.get(url, {'after': self.notes[1].id})
+        self.assertEqual(response.json(), {
+            'results': [
+                {
+                    'id': note.id,
+                    'title': note.title,
+                    'text': note.text,
+                    'slug': note.slug,
+                }
+                for note in self.notes[2:4]
+            ],
+            'next_cursor': self.notes[3].id,
+        })
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('notes:list'), {'after': 'x'})
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_api_requires_login(self):
+        self.client.logout()
+        response = self.client.get(reverse('notes:api_list'))
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
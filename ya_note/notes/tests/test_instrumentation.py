@@ -0,0 +1,48 @@
+import io
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from notes.models import Note
+from yanote.instrumentation import recorder
+
+User = get_user_model()
+
+
+class TestInstrumentation(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        Note.objects.create(title='Заголовок', text='Текст', author=cls.author)
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.perf_dir = Path(directory.name)
+        settings = override_settings(PERF_STATS_DIR=self.perf_dir)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        recorder.reset()
+        self.addCleanup(recorder.reset)
+        self.client.force_login(self.author)
+
+    def test_stats_per_url_name(self):
+        url = reverse('notes:list')
+        for _ in range(2):
+            response = self.client.get(url)
+        self.assertIn('render;dur=', response['Server-Timing'])
+        stats = recorder.snapshot()['windows'][-1]['views']['notes:list']
+        self.assertEqual(stats['count'], 2)
+        self.assertEqual(stats['bytes'], 2 * len(response.content))
+
+    def test_perf_stats_command(self):
+        self.client.get(reverse('notes:list'))
+        recorder.flush()
+        out = io.StringIO()
+        call_command('perf_stats', stdout=out)
+        self.assertIn('notes:list', out.getvalue())
@@ -86,6 +86,18 @@ class NoteTestCase(TestCase):
         expected_slug = slugify(self.form_data['title'])
         self.assertEqual(new_note.slug, expected_slug)
 
+    def test_empty_slug_gets_next_free_suffix(self):
+        Note.objects.create(**{**self.note_data, 'slug': ''})
+        url = reverse('notes:add')
+        form_data = {'title': self.note_data['title'], 'text': 'Text'}
+
+        response = self.client.post(url, data=form_data)
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+        new_note = Note.objects.latest('pk')
+        expected_slug = slugify(self.note_data['title']) + '-2'
+        self.assertEqual(new_note.slug, expected_slug)
+
     def test_author_can_edit_note(self):
         note = Note.objects.create(**self.note_data)
         url = reverse('notes:edit', args=(note.slug,))
@@ -99,6 +111,17 @@ class NoteTestCase(TestCase):
         self.assertEqual(note.text, self.form_data['text'])
         self.assertEqual(note.slug, self.form_data['slug'])
 
+    def test_edit_with_empty_slug_keeps_own_slug(self):
+        note = Note.objects.create(**{**self.note_data, 'slug': ''})
+        url = reverse('notes:edit', args=(note.slug,))
+        form_data = {'title': note.title, 'text': 'New Text', 'slug': ''}
+
+        response = self.client.post(url, data=form_data)
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+        note.refresh_from_db()
+        self.assertEqual(note.slug, slugify(self.note_data['title']))
+
     def test_other_user_cant_edit_note(self):
         note = Note.objects.create(**self.note_data)
         client = Client()
@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase, override_settings
+
+from notes.models import Note
+from yanote.nplusone import NPlusOneError, NPlusOneMiddleware
+
+User = get_user_model()
+
+AUTHORS_TEMPLATE = Template(
+    '{% for note in notes %}\n'
+    '{{ note.author.username }}\n'
+    '{% endfor %}'
+)
+
+
+def render_authors(request):
+    return HttpResponse(AUTHORS_TEMPLATE.render(Context({
+        'notes': Note.objects.order_by('pk'),
+    })))
+
+
+class TestNPlusOne(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        for number in range(3):
+            Note.objects.create(
+                title=f'Заметка {number}', text='Текст', author=cls.author
+            )
+
+    def request_authors(self):
+        return NPlusOneMiddleware(render_authors)(
+            RequestFactory().get('/notes/')
+        )
+
+    def test_reports_template_line(self):
+        with self.assertRaisesRegex(
+            NPlusOneError, r'3 раз из <unknown source>:2'
+        ):
+            self.request_authors()
+
+    @override_settings(NPLUSONE_ALLOW=[r'<unknown source>:2'])
+    def test_allowlist(self):
+        self.assertEqual(self.request_authors().status_code, 200)
@@ -0,0 +1,58 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from notes.models import Note
+
+User = get_user_model()
+
+
+class TestNotesSearch(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.reader = User.objects.create(username='Читатель')
+        cls.in_text = Note.objects.create(
+            title='Покупки', text='Купить молоко и хлеб', author=cls.author
+        )
+        cls.in_title = Note.objects.create(
+            title='Молоко', text='Две бутылки', author=cls.author
+        )
+        cls.foreign = Note.objects.create(
+            title='Молоко', text='Чужая заметка', author=cls.reader
+        )
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    def search(self, query, **params):
+        response = self.client.get(
+            reverse('notes:api_search'), {'q': query, **params}
+        )
+        return [result['id'] for result in response.json()['results']]
+
+    def test_prefix_search_ranks_title_first(self):
+        self.assertEqual(
+            self.search('мол'), [self.in_title.id, self.in_text.id]
+        )
+
+    def test_limit(self):
+        self.assertEqual(self.search('мол', limit=1), [self.in_title.id])
+
+    def test_index_follows_update_and_delete(self):
+        self.in_text.text = 'Купить кефир'
+        self.in_text.save()
+        self.assertEqual(self.search('молоко'), [self.in_title.id])
+        self.assertEqual(self.search('кефир'), [self.in_text.id])
+
+        self.client.post(reverse('notes:delete', args=(self.in_title.slug,)))
+        self.assertEqual(self.search('молоко'), [])
+
+    def test_search_page_highlights_matches(self):
+        response = self.client.get(reverse('notes:search'), {'q': 'хлеб'})
+        self.assertEqual(
+            [result.id for result in response.context['results']],
+            [self.in_text.id],
+        )
+        self.assertContains(response, '<mark>хлеб</mark>')
@@ -0,0 +1,88 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import TestCase
+
+from notes.models import Note
+from notes.slugs import allocate_slug
+from notes.tests.utils import FileDatabaseTestCase
+
+User = get_user_model()
+
+
+class TestSlugAllocation(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+
+    def test_next_free_suffix(self):
+        slugs = [
+            Note.objects.create(
+                title='Заметка', text='Текст', author=self.author
+            ).slug
+            for _ in range(3)
+        ]
+        self.assertEqual(slugs, ['zametka', 'zametka-2', 'zametka-3'])
+
+    def test_allocation_is_one_query(self):
+        Note.objects.create(title='Заметка', text='Текст', author=self.author)
+        with self.assertNumQueries(1):
+            slug = allocate_slug(Note.objects.all(), 'Заметка', 100)
+        self.assertEqual(slug, 'zametka-2')
+
+    def test_long_title_keeps_suffix_within_max_length(self):
+        title = 'Очень длинный заголовок ' * 10
+        first = Note.objects.create(
+            title=title[:100], text='1', author=self.author
+        )
+        second = Note.objects.create(
+            title=title[:100], text='2', author=self.author
+        )
+        self.assertEqual(len(first.slug), 100)
+        self.assertLessEqual(len(second.slug), 100)
+        self.assertTrue(second.slug.endswith('-2'))
+
+
+class TestConcurrentCreate(FileDatabaseTestCase):
+    """Параллельное создание заметок с одинаковым заголовком."""
+    threads = 8
+    notes_per_thread = 5
+
+    def test_concurrent_creates_get_unique_slugs(self):
+        author = User.objects.db_manager(self.alias).create(
+            username='Автор'
+        )
+        errors = []
+        barrier = threading.Barrier(self.threads)
+
+        def create_notes():
+            try:
+                barrier.wait()
+                for _ in range(self.notes_per_thread):
+                    Note(
+                        title='Заметка', text='Текст', author=author
+                    ).save(using=self.alias)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connections[self.alias].close()
+
+        workers = [
+            threading.Thread(target=create_notes)
+            for _ in range(self.threads)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(errors, [])
+        slugs = set(
+            Note.objects.using(self.alias).values_list('slug', flat=True)
+        )
+        self.assertEqual(slugs, {'zametka'} | {
+            f'zametka-{number}'
+            for number in range(2, self.threads * self.notes_per_thread + 1)
+        })
@@ -0,0 +1,28 @@
+import tempfile
+from pathlib import Path
+
+from django.db import connection
+from django.test import SimpleTestCase
+
+from yanote.sqlite.base import DatabaseWrapper
+
+
+class TestProductionSqlite(SimpleTestCase):
+
+    def test_pragmas_are_applied(self):
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = DatabaseWrapper(
+                {
+                    **connection.settings_dict,
+                    'NAME': str(Path(directory) / 'db.sqlite3'),
+                },
+                alias='production',
+            )
+            try:
+                with wrapper.cursor() as cursor:
+                    cursor.execute('PRAGMA journal_mode')
+                    self.assertEqual(cursor.fetchone(), ('wal',))
+                    cursor.execute('PRAGMA synchronous')
+                    self.assertEqual(cursor.fetchone(), (1,))
+            finally:
+                wrapper.close()
@@ -0,0 +1,188 @@
+import threading
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from notes.models import ChangeSequence, Note, NoteTombstone
+from notes.sync import compact_tombstones, get_changes
+from notes.tests.utils import FileDatabaseTestCase
+
+User = get_user_model()
+
+
+class TestNotesSync(TestCase):
+    URL = reverse('notes:api_sync')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.reader = User.objects.create(username='Читатель')
+        cls.notes = [
+            Note.objects.create(
+                title=f'Заметка {number}', text='Текст', author=cls.author
+            )
+            for number in range(3)
+        ]
+        Note.objects.create(title='Чужая', text='Текст', author=cls.reader)
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    def sync(self, since=0, **params):
+        return self.client.get(self.URL, {'since': since, **params}).json()
+
+    def test_full_sync(self):
+        response = self.sync()
+        self.assertEqual(
+            [note['id'] for note in response['notes']],
+            [note.id for note in self.notes]
+        )
+        self.assertFalse(response['more'])
+
+    def test_only_changes_since_cursor(self):
+        cursor = self.sync()['seq']
+        first, second, third = self.notes
+        second.text = 'Новый текст'
+        second.save()
+        self.client.post(reverse('notes:delete', args=(third.slug,)))
+        with self.assertNumQueries(5):
+            response = self.sync(cursor)
+        self.assertEqual(
+            [note['text'] for note in response['notes']], ['Новый текст']
+        )
+        self.assertEqual(response['deleted'], [third.id])
+        self.assertEqual(self.sync(response['seq'])['notes'], [])
+
+    def test_limit_pages_through_changes(self):
+        response = self.sync(limit=2)
+        self.assertTrue(response['more'])
+        rest = self.sync(response['seq'], limit=2)
+        self.assertFalse(rest['more'])
+        self.assertEqual(
+            [note['id'] for note in response['notes'] + rest['notes']],
+            [note.id for note in self.notes]
+        )
+
+    def test_bulk_delete_leaves_tombstones(self):
+        cursor = self.sync()['seq']
+        Note.objects.filter(author=self.author).delete()
+        self.assertEqual(
+            sorted(self.sync(cursor)['deleted']),
+            [note.id for note in self.notes]
+        )
+
+    def test_compacted_tombstones_force_reset(self):
+        first, second, third = self.notes
+        first_id, second_id = first.id, second.id
+        stale_cursor = self.sync()['seq']
+        first.delete()
+        fresh_cursor = self.sync()['seq']
+        second.delete()
+        NoteTombstone.objects.filter(note_id=first_id).update(
+            deleted=timezone.now() - timedelta(days=60)
+        )
+        self.assertEqual(
+            compact_tombstones(timezone.now() - timedelta(days=30)), 1
+        )
+        response = self.client.get(self.URL, {'since': stale_cursor})
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(self.sync(fresh_cursor)['deleted'], [second_id])
+        self.assertEqual(
+            [note['id'] for note in self.sync()['notes']], [third.id]
+        )
+
+    def test_bad_cursor(self):
+        for since in ('abc', -1):
+            with self.subTest(since=since):
+                response = self.client.get(self.URL, {'since': since})
+                self.assertEqual(response.status_code, 404)
+        response = self.client.get(self.URL, {'since': 10 ** 9})
+        self.assertEqual(response.status_code, 410)
+
+    def test_missing_sequence_row(self):
+        # A flushed database has no counter row until the first write.
+        ChangeSequence.objects.all().delete()
+        response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['seq'], 0)
+
+
+class FileDatabaseRouter:
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    def db_for_read(self, model, **hints):
+        return self.alias
+
+    db_for_write = db_for_read
+
+
+class TestConcurrentSync(FileDatabaseTestCase):
+    """Синхронизация во время параллельных изменений заметок."""
+    threads = 4
+    rounds = 10
+
+    def test_replica_converges(self):
+        with override_settings(
+            DATABASE_ROUTERS=[FileDatabaseRouter(self.alias)]
+        ):
+            self.check_replica_converges()
+
+    def check_replica_converges(self):
+        author = User.objects.create(username='Автор')
+        notes = [
+            Note.objects.create(title='Заметка', text='0', author=author)
+            for _ in range(self.threads * 2)
+        ]
+        errors = []
+
+        def edit(own):
+            try:
+                for number in range(1, self.rounds + 1):
+                    for note in own:
+                        note.text = str(number)
+                        note.save()
+                own[-1].delete()
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connections[self.alias].close()
+
+        workers = [
+            threading.Thread(target=edit, args=(notes[number::self.threads],))
+            for number in range(self.threads)
+        ]
+        for worker in workers:
+            worker.start()
+        replica, seqs = self.pull_until_done(author, workers)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(seqs, sorted(seqs))
+        self.assertEqual(replica, {
+            note['id']: note
+            for note in Note.objects.values('id', 'title', 'text', 'slug',
+                                            'seq')
+        })
+        self.assertEqual(len(replica), self.threads)
+
+    @staticmethod
+    def pull_until_done(author, workers):
+        """Реплика заметок, собранная синхронизацией по 5 изменений."""
+        replica, seqs, cursor = {}, [], 0
+        while True:
+            # Последний проход — уже после того, как все потоки закончили.
+            writing = any(worker.is_alive() for worker in workers)
+            changes = get_changes(author, cursor, limit=5)
+            for note in changes.notes:
+                replica[note['id']] = note
+                seqs.append(note['seq'])
+            for note_id in changes.deleted:
+                replica.pop(note_id, None)
+            cursor = changes.seq
+            if not writing and not changes.more:
+                return replica, seqs
@@ -0,0 +1,71 @@
+from pytils.translit import slugify
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.test import TestCase
+
+from notes.models import ChangeSequence, Note
+from notes.synthetic import generate
+
+User = get_user_model()
+
+
+class TestSyntheticNotes(TestCase):
+
+    def snapshot(self):
+        return list(Note.objects.order_by('pk').values_list(
+            'title', 'text', 'author__username'
+        ))
+
+    def test_generates_requested_volume(self):
+        generated = generate(users=20, notes=500, seed=3, batch_size=64)
+
+        self.assertEqual(generated.notes, 500)
+        self.assertEqual(Note.objects.count(), 500)
+        self.assertEqual(
+            User.objects.filter(pk__in=generated.users).count(), 20
+        )
+
+    def test_slugs_come_from_titles_and_are_unique(self):
+        generate(users=5, notes=300, seed=3)
+
+        notes = list(Note.objects.all())
+        self.assertEqual(len({note.slug for note in notes}), len(notes))
+        for note in notes:
+            self.assertTrue(
+                note.slug.startswith(slugify(note.title)[:20]), note.slug
+            )
+
+    def test_change_numbers_are_allocated(self):
+        generate(users=5, notes=120, seed=3, batch_size=50)
+
+        seqs = list(Note.objects.order_by('seq').values_list('seq', flat=True))
+        self.assertEqual(seqs, list(range(1, 121)))
+        self.assertEqual(ChangeSequence.objects.get(pk=1).value, 120)
+
+    def test_notes_per_author_are_skewed(self):
+        generate(users=50, notes=2000, seed=3)
+
+        per_author = sorted(
+            Note.objects.values('author').annotate(
+                total=Count('pk')
+            ).values_list('total', flat=True),
+            reverse=True,
+        )
+        self.assertGreater(per_author[0], 5 * 2000 / 50)
+
+    def test_same_seed_gives_same_data(self):
+        generate(users=5, notes=200, seed=7)
+        first = self.snapshot()
+        Note.objects.all().delete()
+        User.objects.all().delete()
+
+        generate(users=5, notes=200, seed=7)
+        self.assertEqual(
+            [(title, text) for title, text, _ in self.snapshot()],
+            [(title, text) for title, text, _ in first],
+        )
+
+        Note.objects.all().delete()
+        generate(users=5, notes=200, seed=8)
+        self.assertNotEqual(self.snapshot(), first)
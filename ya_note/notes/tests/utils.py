@@ -0,0 +1,37 @@
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test import SimpleTestCase
+
+from notes.models import ChangeSequence, Note, NoteTombstone
+
+User = get_user_model()
+
+
+class FileDatabaseTestCase(SimpleTestCase):
+    """
+    Тесты параллельной записи в отдельный файл базы.
+
+    Тестовая база SQLite в памяти не допускает параллельной записи,
+    поэтому таблицы заметок создаются во временном файле с боевым
+    профилем SQLite под алиасом alias.
+    """
+    alias = 'concurrent_notes'
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        connections.databases[self.alias] = {
+            **connection.settings_dict,
+            'ENGINE': 'yanote.sqlite',
+            'NAME': str(Path(directory.name) / 'db.sqlite3'),
+        }
+        self.addCleanup(connections.databases.pop, self.alias)
+        self.addCleanup(connections.__delitem__, self.alias)
+        self.addCleanup(connections[self.alias].close)
+        with connections[self.alias].schema_editor() as editor:
+            for model in (User, Note, NoteTombstone, ChangeSequence):
+                editor.create_model(model)
+        ChangeSequence.objects.using(self.alias).create(pk=1)
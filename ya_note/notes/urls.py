@@ -1,6 +1,6 @@
 from django.urls import path
 
-from notes import views
+from notes import api, views
 
 app_name = 'notes'
 
@@ -12,4 +12,13 @@ urlpatterns = [
     path('delete/<slug:slug>/', views.NoteDelete.as_view(), name='delete'),
     path('notes/', views.NotesList.as_view(), name='list'),
     path('done/', views.NoteSuccess.as_view(), name='success'),
+    path('search/', views.NotesSearch.as_view(), name='search'),
+    path('api/notes/', api.NotesListApi.as_view(), name='api_list'),
+    path(
+        'api/notes/search/',
+        api.NotesSearchApi.as_view(),
+        name='api_search'
+    ),
+    path('api/notes/sync/', api.NotesSyncApi.as_view(), name='api_sync'),
+    path('api/notes/batch/', api.NotesBatchApi.as_view(), name='api_batch'),
 ]
@@ -1,9 +1,13 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import IntegrityError, transaction
 from django.urls import reverse_lazy
 from django.views import generic
 
-from .forms import NoteForm
+from .cache import note_cache
+from .forms import WARNING, NoteForm
 from .models import Note
+from .pagination import get_notes_page
+from .search import parse_limit, search_notes
 
 
 class Home(generic.TemplateView):
@@ -25,6 +29,19 @@ class NoteBase(LoginRequiredMixin):
         """Пользователь может работать только со своими заметками."""
         return self.model.objects.filter(author=self.request.user)
 
+    def form_valid(self, form):
+        """Если slug заняли уже после проверки формы, сообщает об ошибке."""
+        try:
+            with transaction.atomic():
+                response = super().form_valid(form)
+        except IntegrityError:
+            slug = form.cleaned_data['slug']
+            if not slug or not Note.objects.filter(slug=slug).exists():
+                raise
+            form.add_error('slug', slug + WARNING)
+            return self.form_invalid(form)
+        return response
+
 
 class NoteCreate(NoteBase, generic.CreateView):
     """Добавление заметки."""
@@ -32,9 +49,7 @@ class NoteCreate(NoteBase, generic.CreateView):
     form_class = NoteForm
 
     def form_valid(self, form):
-        new_note = form.save(commit=False)
-        new_note.author = self.request.user
-        new_note.save()
+        form.instance.author = self.request.user
         return super().form_valid(form)
 
 
@@ -50,10 +65,42 @@ class NoteDelete(NoteBase, generic.DeleteView):
 
 
 class NotesList(NoteBase, generic.ListView):
-    """Список всех заметок пользователя."""
+    """Список всех заметок пользователя, по странице за раз."""
     template_name = 'notes/list.html'
 
+    def get_context_data(self, **kwargs):
+        notes, next_cursor = get_notes_page(
+            self.object_list, self.request.GET.get('after')
+        )
+        context = super().get_context_data(object_list=notes, **kwargs)
+        context['next_cursor'] = next_cursor
+        return context
+
 
 class NoteDetail(NoteBase, generic.DetailView):
     """Заметка подробно."""
     template_name = 'notes/detail.html'
+
+    def get_object(self, queryset=None):
+        """Заметка из кеша, а при промахе — из базы с записью в кеш."""
+        data = note_cache.get(self.request.user.pk, self.kwargs['slug'])
+        if data is not None:
+            return self.model(**data)
+        note = super().get_object(queryset)
+        note_cache.set(note)
+        return note
+
+
+class NotesSearch(LoginRequiredMixin, generic.TemplateView):
+    """Поиск по заметкам пользователя."""
+    template_name = 'notes/search.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.request.GET.get('q', '')
+        context['results'] = search_notes(
+            self.request.user,
+            context['query'],
+            parse_limit(self.request.GET.get('limit')),
+        )
+        return context
@@ -0,0 +1,76 @@
+import json
+import statistics
+import time
+from pathlib import Path
+
+
+def measure(func, rounds=15, min_time=0.05):
+    """
+    Время одного вызова func в мс: медиана и минимум по раундам.
+
+    Число вызовов в раунде подбирается так, чтобы раунд длился не меньше
+    min_time секунд, — как в pytest-benchmark.
+    """
+    func()
+    iterations = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        iterations *= 2
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        timings.append((time.perf_counter() - started) / iterations * 1000)
+    return {
+        'median_ms': statistics.median(timings),
+        'min_ms': min(timings),
+        'iterations': iterations,
+        'rounds': rounds,
+    }
+
+
+def load_baseline(path):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baseline(path, results):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + '\n')
+
+
+def compare(results, baseline, threshold, min_delta_ms=0.05):
+    """
+    Строки отчёта и список замедлившихся случаев.
+
+    Сравниваются минимумы — они меньше всего зависят от фоновой
+    нагрузки: случай замедлился, если минимум больше базового больше
+    чем на долю threshold и больше чем на min_delta_ms. У случаев
+    короче миллисекунды шум легко превышает любую долю, поэтому без
+    абсолютного порога проверка падала бы без изменений в коде.
+    """
+    lines, regressions = [], []
+    for name, result in results.items():
+        line = (
+            f'{name:<28}{result["min_ms"]:>10.3f} мс '
+            f'(медиана {result["median_ms"]:.3f})'
+        )
+        before = baseline.get(name)
+        if before:
+            change = result['min_ms'] / before['min_ms'] - 1
+            line += f'  {change:>+7.1%} к базовому'
+            delta = result['min_ms'] - before['min_ms']
+            if change > threshold and delta > min_delta_ms:
+                regressions.append(name)
+                line += '  ЗАМЕДЛЕНИЕ'
+        lines.append(line)
+    return lines, regressions
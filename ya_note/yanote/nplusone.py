@@ -0,0 +1,118 @@
+import logging
+import os
+import re
+import sys
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Списки IN (%s, %s, ...) разной длины — один и тот же запрос.
+IN_LIST = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+
+
+class NPlusOneError(Exception):
+    """В запросе к сайту повторяются одинаковые SQL-запросы."""
+
+
+def find_location():
+    """
+    Откуда выполнен запрос: строка шаблона и место в коде проекта.
+
+    Ищется ближайший узел шаблона в стеке (render_annotated знает
+    свой токен с номером строки) и ближайший кадр из файлов проекта.
+    Пакет настроек с промежуточными слоями и обёртками запросов
+    пропускается.
+    """
+    template = code = None
+    base_dir = str(settings.BASE_DIR)
+    own_package = os.path.dirname(__file__)
+    frame = sys._getframe(2)
+    while frame and not (template and code):
+        node = frame.f_locals.get('self')
+        if (
+            template is None
+            and frame.f_code.co_name == 'render_annotated'
+            and getattr(node, 'token', None) and getattr(node, 'origin', None)
+        ):
+            name = node.origin.template_name or node.origin.name
+            template = f'{name}:{node.token.lineno}'
+        filename = frame.f_code.co_filename
+        if (
+            code is None
+            and filename.startswith(base_dir)
+            and 'site-packages' not in filename
+            and not filename.startswith(own_package)
+        ):
+            code = f'{filename[len(base_dir) + 1:]}:{frame.f_lineno}'
+        frame = frame.f_back
+    return ', '.join(filter(None, (template, code))) or 'неизвестно'
+
+
+class QueryPatterns:
+    """Считает SQL-запросы одной формы и запоминает, откуда они."""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.counts = Counter()
+        self.locations = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        shape = IN_LIST.sub('(...)', sql)
+        self.counts[shape] += 1
+        # Стек разбирается один раз на форму запроса, только для повторов.
+        if self.counts[shape] == self.threshold:
+            self.locations[shape] = find_location()
+        return execute(sql, params, many, context)
+
+    def repeated(self, allow=()):
+        """Повторы (форма, число, место) не из списка разрешённых."""
+        return [
+            (shape, count, self.locations[shape])
+            for shape, count in self.counts.most_common()
+            if count >= self.threshold and not any(
+                re.search(pattern, shape)
+                or re.search(pattern, self.locations[shape])
+                for pattern in allow
+            )
+        ]
+
+
+def format_report(request, repeated):
+    lines = [f'N+1 запросов в {request.method} {request.path}:']
+    for shape, count, location in repeated:
+        lines.append(f'  {count} раз из {location}: {shape}')
+    return '\n'.join(lines)
+
+
+class NPlusOneMiddleware:
+    """
+    Находит N+1: одинаковые по форме SQL-запросы внутри одного запроса.
+
+    С NPLUSONE_RAISE (так в тестах) бросает NPlusOneError, при DEBUG
+    пишет предупреждение в лог, иначе не делает ничего. Формы запросов
+    и места, где повторы допустимы, перечисляются регулярными
+    выражениями в NPLUSONE_ALLOW.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not (settings.NPLUSONE_RAISE or settings.DEBUG):
+            return self.get_response(request)
+        patterns = QueryPatterns(settings.NPLUSONE_THRESHOLD)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(patterns))
+            response = self.get_response(request)
+        repeated = patterns.repeated(settings.NPLUSONE_ALLOW)
+        if repeated:
+            report = format_report(request, repeated)
+            if settings.NPLUSONE_RAISE:
+                raise NPlusOneError(report)
+            logger.warning(report)
+        return response
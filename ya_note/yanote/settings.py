@@ -1,3 +1,5 @@
+import os
+import tempfile
 from pathlib import Path
 
 from django.urls import reverse_lazy
@@ -22,6 +24,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'yanote.instrumentation.InstrumentationMiddleware',
+    'yanote.nplusone.NPlusOneMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -59,6 +63,16 @@ DATABASES = {
     }
 }
 
+# Профиль SQLite: 'default' или 'production' (WAL, настроенные PRAGMA
+# и постоянные соединения). Выбирается переменной окружения.
+SQLITE_PROFILE = os.getenv('SQLITE_PROFILE', 'default')
+
+if SQLITE_PROFILE == 'production':
+    DATABASES['default'].update({
+        'ENGINE': 'yanote.sqlite',
+        'CONN_MAX_AGE': 600,
+    })
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -87,3 +101,50 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('notes:home')
+
+NOTES_PER_PAGE = 50
+
+NOTES_SEARCH_LIMIT = 50
+
+# Синхронизация: изменений за запрос и сколько дней хранить надгробия.
+NOTES_SYNC_LIMIT = 500
+NOTES_TOMBSTONE_DAYS = 30
+
+# Наибольшее число элементов в одном запросе к api/notes/batch/.
+NOTES_BATCH_LIMIT = 500
+
+# Кеш заметок: алиас бэкенда из CACHES и локальный уровень в процессе.
+NOTES_CACHE_ALIAS = 'default'
+NOTES_CACHE_LOCAL_SIZE = 1024
+NOTES_CACHE_LOCAL_TTL = 60
+
+# Замеры запросов: скользящие окна статистики и каталог, куда процессы
+# сбрасывают её для команды perf_stats.
+PERF_WINDOW = 300
+PERF_WINDOWS = 12
+PERF_FLUSH_INTERVAL = 10
+PERF_STATS_DIR = Path(tempfile.gettempdir()) / 'yanote-perf'
+
+# Поиск N+1: сколько одинаковых запросов считать повтором, бросать ли
+# исключение (включается в тестах) и какие повторы допустимы.
+NPLUSONE_THRESHOLD = 3
+NPLUSONE_RAISE = False
+NPLUSONE_ALLOW = []
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'yanote.instrumentation': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+        'yanote.nplusone': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+    },
+}